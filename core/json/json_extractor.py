@@ -5,7 +5,14 @@ This module handles the first step of the translation pipeline.
 
 import os
 import json
-from typing import Dict, List, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
+
+# Maximum number of JSON files read in parallel
+MAX_LOAD_WORKERS = 32
 
 def extract_strings_from_json(json_obj: Any, prefix: str = "") -> Dict[str, str]:
     """
@@ -56,28 +63,46 @@ def process_json_files(src_dir: str) -> Tuple[Dict[str, Dict[str, str]], Dict[st
     extracted_strings = {}
     json_files = {}
     
-    # Process each JSON file in the directory
-    for filename in os.listdir(src_dir):
-        if filename.endswith('.json'):
-            file_path = os.path.join(src_dir, filename)
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                    
-                # Extract strings from the JSON file
-                file_strings = extract_strings_from_json(json_data)
-                
-                # Store the extracted strings and original JSON
-                extracted_strings[filename] = file_strings
-                json_files[filename] = json_data
-                
-                print(f"Processed {filename}: {len(file_strings)} strings extracted")
-            except Exception as e:
-                print(f"Error processing {filename}: {str(e)}")
+    filenames = [filename for filename in os.listdir(src_dir) if filename.endswith('.json')]
+    if not filenames:
+        return extracted_strings, json_files
+    
+    # Read and parse the files in parallel, then report them in directory order
+    file_paths = [os.path.join(src_dir, filename) for filename in filenames]
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(file_paths))) as executor:
+        results = list(executor.map(_load_json_file, file_paths))
+    
+    for filename, (json_data, error) in zip(filenames, results):
+        if error is not None:
+            print(f"Error processing {filename}: {error}")
+            continue
+        
+        # Extract strings from the JSON file
+        file_strings = extract_strings_from_json(json_data)
+        
+        # Store the extracted strings and original JSON
+        extracted_strings[filename] = file_strings
+        json_files[filename] = json_data
+        
+        print(f"Processed {filename}: {len(file_strings)} strings extracted")
     
     return extracted_strings, json_files
 
+def _load_json_file(file_path: str) -> Tuple[Any, Optional[str]]:
+    """
+    Read and parse one JSON file.
+    
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Tuple of (parsed JSON object, None) or (None, error message) if the file could not be loaded
+    """
+    try:
+        return fast_json.load_file(file_path), None
+    except Exception as e:
+        return None, str(e)
+
 def extract_strings(json_files: Dict[str, Dict], output_dir: str = None) -> Dict[str, Dict[str, str]]:
     """
     Extract translatable strings from JSON files.
@@ -101,7 +126,7 @@ def extract_strings(json_files: Dict[str, Dict], output_dir: str = None) -> Dict
         
         # Save to file if output directory is provided
         if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
+            ensure_dir(output_dir)
             output_path = os.path.join(output_dir, f"{filename}_extracted.json")
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(file_strings, f, indent=2, ensure_ascii=False)
@@ -6,22 +6,30 @@ This module handles the fifth step of the translation pipeline.
 import os
 import json
 import copy
-from typing import Dict, List, Any
+import functools
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
 
-def load_language_codes() -> Dict[str, str]:
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
+
+@functools.lru_cache(maxsize=1)
+def load_language_codes() -> Mapping[str, str]:
     """
     Load language codes from the languages.json file.
+    The result is cached, so the file is read at most once per process,
+    and returned read-only so callers cannot alter the shared copy.
     
     Returns:
-        Dictionary mapping language names to language codes
+        Read-only mapping of language names to language codes
     """
     try:
         with open("data/languages.json", "r", encoding="utf-8") as f:
-            return json.load(f)
+            return MappingProxyType(json.load(f))
     except FileNotFoundError:
         print("Warning: data/languages.json not found. Using fallback minimal language codes.")
         # Fallback to minimal set of language codes
-        return {
+        return MappingProxyType({
             "English": "en",
             "Spanish": "es",
             "French": "fr",
@@ -29,7 +37,22 @@ def load_language_codes() -> Dict[str, str]:
             "Chinese": "zh",
             "Simplified Chinese": "zh-CN",
             "Traditional Chinese": "zh-TW"
-        }
+        })
+
+@functools.lru_cache(maxsize=1)
+def load_language_names() -> Mapping[str, str]:
+    """
+    Invert the language codes loaded from languages.json.
+    Cached like load_language_codes, so it is built once per process.
+    
+    Returns:
+        Read-only mapping of language codes to language names
+    """
+    return MappingProxyType({code: name for name, code in load_language_codes().items()})
+
+def get_language_name(language: str) -> str:
+    """Get the display name for a language code from languages.json, or the code itself."""
+    return load_language_names().get(language, language)
 
 # Load language codes from file
 LANGUAGE_CODES = load_language_codes()
@@ -90,12 +113,12 @@ def generate_translated_jsons(
 
             # Create language-specific directory in translations folder
             lang_dir = os.path.join(output_dir, "translations", language_code)
-            os.makedirs(lang_dir, exist_ok=True)
+            ensure_dir(lang_dir)
 
             # Save the translated JSON using the original filename
             json_path = os.path.join(lang_dir, filename)
             with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(translated_json, f, ensure_ascii=False, indent=2)
+                f.write(fast_json.dumps_pretty(translated_json))
 
             print(f"Generated {filename} for {language} in {lang_dir}")
 
@@ -6,11 +6,30 @@ This module handles the second step of the translation pipeline.
 import os
 import csv
 import json
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
 # Import the user-provided OpenAI wrapper and context configuration
 from utils.api.util_call import call_openai
+from utils.api.llm_cache import LLMCache, get_llm_cache
+from utils.serialization import fast_json, msgpack_store
 from utils.config.context_configuration import get_system_prompt
+from core.json.json_generator import get_language_name
+from utils.filesystem.directories import ensure_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Placeholder for options that could not be generated
+_TRANSLATION_ERROR = "Translation error"
+
+# Placeholder prefixes marking options that must not be cached
+_ERROR_OPTION_PREFIXES = ("Error:", _TRANSLATION_ERROR)
+
+# Estimated token budget (prompt strings plus generated options) for one options request
+MAX_BATCH_TOKENS = 2000
 
 def generate_translation_options(
     extracted: Dict[str, Dict[str, str]],
@@ -32,7 +51,8 @@ def generate_translation_options(
         options_count: Number of options to generate for each string
         output_dir: Directory to save intermediate results (optional)
         project_context: Additional context for the translation
-        batch_size: Number of strings to translate in each batch
+        batch_size: Maximum number of strings to translate in each batch; batches
+                    are also cut early to stay within MAX_BATCH_TOKENS
         mock_mode: Whether to run in mock mode without API calls
         
     Returns:
@@ -69,97 +89,207 @@ def generate_translation_options(
             
         return options
 
-    for filename, strings in extracted.items():
-        options[filename] = {}
-
-        # Process strings in batches to reduce API calls
-        string_items = list(strings.items())
+    # List the output directory once instead of checking each options file separately;
+    # files written below belong to the file being processed, so the listing stays valid
+    existing_files = _list_dir(output_dir)
 
-        for i in range(0, len(string_items), batch_size):
-            batch = string_items[i:i+batch_size]
-            batch_paths = [path for path, _ in batch]
-            batch_strings = [string for _, string in batch]
+    for filename, strings in extracted.items():
+        # Create every path entry up front so batches only fill in languages
+        file_options = options[filename] = {path: {} for path in strings}
+
+        # Group paths by source string so each distinct string is translated once
+        paths_by_string = {}
+        for path, string in strings.items():
+            paths_by_string.setdefault(string, []).append(path)
+        unique_strings = list(paths_by_string)
+
+        # Languages whose options file already exists are loaded once and never requested
+        csv_names = {language: f"{filename}_{language}_options.csv" for language in languages}
+        pending_languages = []
+        for language in languages:
+            if csv_names[language] not in existing_files:
+                pending_languages.append(language)
+                continue
 
-            # Generate options for each language
-            for language in languages:
-                # Check if output file exists - if so, skip this language
-                csv_path = os.path.join(
-                    output_dir, f"{filename}_{language}_options.csv"
+            logger.info(f"Skipping existing options for {language} in {filename}")
+
+            # Add existing options to the options dictionary
+            # (paths not found in existing options get a list of empty options)
+            existing_options = _load_existing_options(os.path.join(output_dir, csv_names[language]))
+            for path, path_options in file_options.items():
+                path_options[language] = existing_options.get(path) or [""] * options_count
+
+        if not pending_languages:
+            continue
+
+        # Process distinct strings in batches to reduce API calls
+        batches = _pack_batches(unique_strings, batch_size, options_count * len(pending_languages))
+        for batch_number, batch_strings in enumerate(batches, 1):
+            # Request all pending languages in a single call when there are several
+            batch_results = {}
+            if len(pending_languages) > 1:
+                batch_results = _generate_multilang_batch_options(
+                    batch_strings, pending_languages, model, options_count, project_context
                 )
-                if os.path.exists(csv_path):
-                    print(f"Skipping existing options for {language} in {filename}")
-
-                    # Load existing options from CSV
-                    existing_options = {}
-                    with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
-                        reader = csv.reader(csvfile)
-                        header = next(reader)  # Skip header
-                        option_count = len(header) - 2  # Subtract Path and Original columns
-
-                        for row in reader:
-                            if len(row) >= 2 + option_count:
-                                path = row[0]
-                                existing_options[path] = row[2:2+option_count]
-
-                    # Add to options dictionary
-                    for path in batch_paths:
-                        if path not in options[filename]:
-                            options[filename][path] = {}
-                        if path in existing_options:
-                            options[filename][path][language] = existing_options[path]
-                        else:
-                            # If path not found in existing options, initialize with empty list
-                            options[filename][path][language] = [""] * options_count
-
-                    continue
-
-                # Generate new options
-                batch_options = _generate_batch_options(batch_strings, language, model, options_count, project_context)
-
-                # Store options - with better error handling
-                for j, path in enumerate(batch_paths):
-                    if path not in options[filename]:
-                        options[filename][path] = {}
 
+            # Fall back to one call per language for anything the combined call missed;
+            # the calls are network-bound, so they run concurrently instead of queuing
+            fallback_languages = [language for language in pending_languages if language not in batch_results]
+            with ThreadPoolExecutor(max_workers=max(1, len(fallback_languages))) as executor:
+                futures = {
+                    language: executor.submit(
+                        _generate_batch_options, batch_strings, language, model, options_count, project_context
+                    )
+                    for language in fallback_languages
+                }
+            for language, future in futures.items():
+                batch_results[language] = future.result()
+
+            for language in pending_languages:
+                batch_options = batch_results[language]
+
+                # Store options for every path sharing each string - with better error handling
+                for j, string in enumerate(batch_strings):
                     # Ensure batch_options has enough entries
                     if j < len(batch_options):
-                        options[filename][path][language] = batch_options[j]
+                        string_options = batch_options[j]
                     else:
-                        print(f"Warning: Missing options for path {path} in {language}. Generating placeholder.")
+                        logger.warning(f"Missing options for string {string!r} in {language}. Generating placeholder.")
                         # Create placeholder options
-                        options[filename][path][language] = ["Translation error"] * options_count
+                        string_options = [_TRANSLATION_ERROR] * options_count
 
-            print(f"Processed batch {i//batch_size + 1}/{(len(string_items) - 1)//batch_size + 1} for {filename}")
+                    for path in paths_by_string[string]:
+                        file_options[path][language] = string_options
 
-        # Save options to CSV for each language
-        for language in languages:
-            csv_path = os.path.join(
-                output_dir, f"{filename}_{language}_options.csv"
-            )
+            logger.debug(f"Processed batch {batch_number}/{len(batches)} for {filename}")
 
-            # Skip writing if file already exists
-            if os.path.exists(csv_path):
-                continue
+        # Save options to CSV for each newly generated language
+        for language in pending_languages:
+            csv_path = os.path.join(output_dir, csv_names[language])
+
+            # Build all rows up front, writing a placeholder where options are missing
+            # (file_options was built from strings, so both iterate in the same order)
+            placeholder = [_TRANSLATION_ERROR] * options_count
+            rows = [
+                [path, string] + path_options.get(language, placeholder)
+                for (path, string), path_options in zip(strings.items(), file_options.values())
+            ]
 
             with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
-                header = ["Path", "Original"] + [f"Option {i+1}" for i in range(options_count)]
-                writer.writerow(header)
-
-                for path, string in strings.items():
-                    # Check if we have options for this path and language
-                    if path in options[filename] and language in options[filename][path]:
-                        row = [path, string] + options[filename][path][language]
-                        writer.writerow(row)
-                    else:
-                        # Write placeholder if missing
-                        row = [path, string] + ["Translation error"] * options_count
-                        writer.writerow(row)
+                writer.writerow(["Path", "Original"] + [f"Option {i+1}" for i in range(options_count)])
+                writer.writerows(rows)
 
-            print(f"Saved translation options for {language} in {filename}")
+            # Keep a MessagePack copy so resumed runs can skip CSV parsing
+            if msgpack_store.AVAILABLE:
+                msgpack_store.dump(
+                    {row[0]: row[2:] for row in rows}, _options_msgpack_path(csv_path)
+                )
+
+            logger.info(f"Saved translation options for {language} in {filename}")
 
     return options
 
+def _list_dir(path: str) -> set:
+    """
+    Get the names of the entries in a directory.
+
+    Args:
+        path: Directory to list
+
+    Returns:
+        Set of entry names, empty if the directory does not exist
+    """
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def _pack_batches(strings: List[str], batch_size: int, outputs_per_string: int) -> List[List[str]]:
+    """
+    Split strings into batches by estimated token count as well as by string count.
+
+    Args:
+        strings: Strings to translate, in order
+        batch_size: Maximum number of strings per batch
+        outputs_per_string: Number of translations the model returns for each string
+
+    Returns:
+        List of batches; a string that exceeds the budget on its own gets a batch to itself
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for string in strings:
+        # Each string is sent once and comes back outputs_per_string times
+        tokens = _estimate_tokens(string) * (1 + outputs_per_string)
+        if current and (len(current) >= batch_size or current_tokens + tokens > MAX_BATCH_TOKENS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(string)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a string (about four characters per token)."""
+    return len(text) // 4 + 1
+
+def _options_msgpack_path(csv_path: str) -> str:
+    """Get the path of the MessagePack copy of an options CSV."""
+    return os.path.splitext(csv_path)[0] + ".msgpack"
+
+def _load_existing_options(csv_path: str) -> Dict[str, List[str]]:
+    """
+    Load previously saved translation options, preferring the MessagePack copy
+    unless the CSV was modified after it.
+
+    Args:
+        csv_path: Path to an options CSV written by generate_translation_options
+
+    Returns:
+        Dictionary mapping paths to lists of translation options
+    """
+    if not msgpack_store.AVAILABLE:
+        return _load_options_csv(csv_path)
+
+    msgpack_path = _options_msgpack_path(csv_path)
+    try:
+        if os.stat(msgpack_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns:
+            return msgpack_store.load(msgpack_path)
+    except FileNotFoundError:
+        pass
+
+    # The CSV is newer (e.g. edited by hand) or has no copy yet; reload it and refresh the copy
+    existing_options = _load_options_csv(csv_path)
+    msgpack_store.dump(existing_options, msgpack_path)
+    return existing_options
+
+def _load_options_csv(csv_path: str) -> Dict[str, List[str]]:
+    """
+    Load previously saved translation options from a CSV file.
+
+    Args:
+        csv_path: Path to an options CSV written by generate_translation_options
+
+    Returns:
+        Dictionary mapping paths to lists of translation options
+    """
+    existing_options = {}
+    with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)  # Skip header
+        option_count = len(header) - 2  # Subtract Path and Original columns
+
+        for row in reader:
+            if len(row) >= 2 + option_count:
+                existing_options[row[0]] = row[2:2+option_count]
+
+    return existing_options
+
 def _generate_batch_options(
     strings: List[str],
     language: str,
@@ -169,6 +299,7 @@ def _generate_batch_options(
 ) -> List[List[str]]:
     """
     Generate translation options for a batch of strings.
+    Options found in the LLM cache are reused; only the remaining strings are sent to the model.
 
     Args:
         strings: List of strings to translate
@@ -180,16 +311,43 @@ def _generate_batch_options(
     Returns:
         List of lists of translation options
     """
-    # Get language name from language code by loading languages.json
-    try:
-        with open("data/languages.json", "r", encoding="utf-8") as f:
-            language_data = json.load(f)
-            # Swap keys and values to get a mapping from code to name
-            code_to_name = {code: name for name, code in language_data.items()}
-            language_name = code_to_name.get(language, language)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Fallback to just using the language code
-        language_name = language
+    cache = get_llm_cache()
+    keys = [_options_cache_key(string, language, model, options_count, project_context) for string in strings]
+    options = [cache.get(key) for key in keys]
+
+    missing = [i for i, opts in enumerate(options) if opts is None]
+    if missing:
+        requested = _request_batch_options(
+            [strings[i] for i in missing], language, model, options_count, project_context
+        )
+        for i, opts in zip(missing, requested):
+            options[i] = opts
+            if _is_cacheable(opts):
+                cache.set(keys[i], opts)
+
+    return options
+
+def _request_batch_options(
+    strings: List[str],
+    language: str,
+    model: str,
+    options_count: int,
+    project_context: str = None
+) -> List[List[str]]:
+    """
+    Request translation options for a batch of strings from the model.
+
+    Args:
+        strings: List of strings to translate
+        language: Target language for translation
+        model: Model to use for translation
+        options_count: Number of options to generate per string
+        project_context: Custom project context (or None to use default)
+
+    Returns:
+        List of lists of translation options
+    """
+    language_name = get_language_name(language)
     
     # Get the appropriate system prompt using the project context
     system_prompt = get_system_prompt(
@@ -202,63 +360,313 @@ def _generate_batch_options(
     # Add explicit instruction to translate to the specific language
     user_message = f"Translate the following strings to {language_name} ({language}):\n" + "\n".join(strings)
 
-    # Use the provided wrapper function
+    # Use the provided wrapper function; the schema constrains the model to the expected shape
     technical_prompt = {
         "system": system_prompt,
         "user": user_message,
-        "response_format": "json"
+        "response_format": _options_response_format(options_count)
     }
 
     try:
         response_text = call_openai(prompt=technical_prompt, model=model)
-        print(f"Raw API response: {response_text[:200]}...")  # Print first 200 chars for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Raw API response: {response_text[:200]}...")  # Log first 200 chars for debugging
 
         # Parse the response
         try:
-            response_data = json.loads(response_text)
-            if not isinstance(response_data, dict) or "translations" not in response_data:
-                print(f"Invalid response format. Expected dict with 'translations' key. Got: {type(response_data)}")
-                return [[f"Error: Invalid response format"] * options_count] * len(strings)
-
-            options = response_data["translations"]
-            if not isinstance(options, list):
-                print(f"Invalid translations format. Expected list. Got: {type(options)}")
-                return [[f"Error: Invalid translations format"] * options_count] * len(strings)
-
-            # Validate and fix each translation option
-            for i, opts in enumerate(options):
-                if not isinstance(opts, list):
-                    print(f"Invalid option format for string {i}. Expected list. Got: {type(opts)}")
-                    options[i] = [f"Error: Invalid option format"] * options_count
-                    continue
-
-                # Ensure we have the correct number of options
-                if len(opts) < options_count:
-                    print(f"Warning: Got {len(opts)} options for string {i}, expected {options_count}. Padding with duplicates.")
-                    options[i] = opts + [opts[0]] * (options_count - len(opts))
-                elif len(opts) > options_count:
-                    print(f"Warning: Got {len(opts)} options for string {i}, expected {options_count}. Truncating.")
-                    options[i] = opts[:options_count]
-
-                # Validate each option is a string
-                options[i] = [str(opt) if opt is not None else "Translation error" for opt in options[i]]
-
-            # Ensure we have the right number of strings
-            if len(options) < len(strings):
-                print(f"Warning: Got {len(options)} translations but expected {len(strings)}. Padding with empty translations.")
-                while len(options) < len(strings):
-                    options.append(["Translation error"] * options_count)
-
-            return options
-
+            options = fast_json.loads(response_text)["translations"]
         except json.JSONDecodeError as e:
-            print(f"Error parsing JSON response: {e}")
-            print(f"Response text: {response_text[:500]}...")  # Print first 500 chars for debugging
-            return [[f"Error: Invalid JSON response"] * options_count] * len(strings)
+            logger.error(f"Error parsing JSON response: {e}")
+            logger.debug(f"Response text: {response_text[:500]}...")  # Log first 500 chars for debugging
+            return _error_batch("Error: Invalid JSON response", len(strings), options_count)
+        except (KeyError, TypeError):
+            logger.warning("Invalid response format. Expected dict with 'translations' key.")
+            return _error_batch("Error: Invalid response format", len(strings), options_count)
+
+        return _normalize_options(options, len(strings), options_count)
 
     except Exception as e:
-        print(f"Error calling OpenAI API: {e}")
-        return [[f"Error: API call failed"] * options_count] * len(strings)
+        logger.error(f"Error calling OpenAI API: {e}")
+        return _error_batch("Error: API call failed", len(strings), options_count)
+
+@functools.lru_cache(maxsize=None)
+def _options_response_format(options_count: int) -> Dict[str, Any]:
+    """
+    Build the structured-output response format for an options request.
+
+    Args:
+        options_count: Number of options expected per string
+
+    Returns:
+        response_format value restricting the reply to {"translations": [[option, ...], ...]}
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "translation_options",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "translations": {
+                        "type": "array",
+                        "items": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "minItems": options_count,
+                            "maxItems": options_count
+                        }
+                    }
+                },
+                "required": ["translations"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+@functools.lru_cache(maxsize=None)
+def _multilang_options_response_format(languages: tuple, options_count: int) -> Dict[str, Any]:
+    """
+    Build the structured-output response format for a multi-language options request.
+
+    Args:
+        languages: Language identifiers the reply is keyed by
+        options_count: Number of options expected per string and language
+
+    Returns:
+        response_format value restricting the reply to
+        {"translations": [{language: [option, ...], ...}, ...]}
+    """
+    options_schema = {
+        "type": "array",
+        "items": {"type": "string"},
+        "minItems": options_count,
+        "maxItems": options_count
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "multilang_translation_options",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "translations": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {language: options_schema for language in languages},
+                            "required": list(languages),
+                            "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["translations"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+def _generate_multilang_batch_options(
+    strings: List[str],
+    languages: List[str],
+    model: str,
+    options_count: int,
+    project_context: str = None
+) -> Dict[str, List[List[str]]]:
+    """
+    Generate translation options for a batch of strings in several languages with one API call.
+    Options found in the LLM cache are reused; only strings missing for some language are sent.
+
+    Args:
+        strings: List of strings to translate
+        languages: Target languages for translation
+        model: Model to use for translation
+        options_count: Number of options to generate per string and language
+        project_context: Custom project context (or None to use default)
+
+    Returns:
+        Dictionary mapping each language that was answered correctly to its
+        list of lists of translation options; missing languages should be
+        retried one at a time
+    """
+    cache = get_llm_cache()
+    keys = {
+        language: [_options_cache_key(string, language, model, options_count, project_context) for string in strings]
+        for language in languages
+    }
+    results = {language: [cache.get(key) for key in keys[language]] for language in languages}
+
+    missing = [i for i in range(len(strings)) if any(results[language][i] is None for language in languages)]
+    if not missing:
+        return results
+
+    pending_languages = [language for language in languages if any(opts is None for opts in results[language])]
+    requested = _request_multilang_batch_options(
+        [strings[i] for i in missing], pending_languages, model, options_count, project_context
+    )
+    for language in pending_languages:
+        if language not in requested:
+            # Leave the language to the single-language fallback
+            del results[language]
+            continue
+        for i, opts in zip(missing, requested[language]):
+            if results[language][i] is None:
+                results[language][i] = opts
+                if _is_cacheable(opts):
+                    cache.set(keys[language][i], opts)
+
+    return results
+
+def _request_multilang_batch_options(
+    strings: List[str],
+    languages: List[str],
+    model: str,
+    options_count: int,
+    project_context: str = None
+) -> Dict[str, List[List[str]]]:
+    """
+    Request translation options for a batch of strings in several languages from the model.
+
+    Args:
+        strings: List of strings to translate
+        languages: Target languages for translation
+        model: Model to use for translation
+        options_count: Number of options to generate per string and language
+        project_context: Custom project context (or None to use default)
+
+    Returns:
+        Dictionary mapping each language that was answered correctly to its
+        list of lists of translation options; missing languages should be
+        retried one at a time
+    """
+    language_labels = [f"{get_language_name(language)} ({language})" for language in languages]
+
+    # Get the appropriate system prompt using the project context
+    system_prompt = get_system_prompt(
+        "generate_options_multilang",
+        language=", ".join(language_labels),
+        options_count=options_count,
+        project_context=project_context
+    )
+
+    user_message = (
+        f"Translate the following strings to each of these languages: {', '.join(language_labels)}.\n"
+        f"Key the options for each string by the language identifier in parentheses "
+        f"({', '.join(languages)}):\n" + "\n".join(strings)
+    )
+
+    # The schema constrains the model to one options list per string and language
+    technical_prompt = {
+        "system": system_prompt,
+        "user": user_message,
+        "response_format": _multilang_options_response_format(tuple(languages), options_count)
+    }
+
+    try:
+        response_text = call_openai(prompt=technical_prompt, model=model)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Raw API response: {response_text[:200]}...")  # Log first 200 chars for debugging
+        response_data = fast_json.loads(response_text)
+    except Exception as e:
+        logger.warning(f"Error in multi-language options call, falling back to per-language calls: {e}")
+        return {}
+
+    translations = response_data.get("translations") if isinstance(response_data, dict) else None
+    if not isinstance(translations, list) or not all(isinstance(entry, dict) for entry in translations):
+        logger.warning("Invalid multi-language response format. Falling back to per-language calls.")
+        return {}
+    if len(translations) != len(strings):
+        logger.warning(f"Got {len(translations)} multi-language entries but expected {len(strings)}. Falling back to per-language calls.")
+        return {}
+
+    # Fan the per-string entries out into one options list per language
+    results = {}
+    for language in languages:
+        if not all(language in entry for entry in translations):
+            logger.warning(f"Multi-language response is missing {language}. Retrying it separately.")
+            continue
+        results[language] = _normalize_options(
+            [entry[language] for entry in translations], len(strings), options_count
+        )
+
+    return results
+
+def _error_batch(message: str, strings_count: int, options_count: int) -> List[List[str]]:
+    """
+    Build placeholder options for a batch that failed.
+
+    Args:
+        message: Placeholder text for every option
+        strings_count: Number of strings in the batch
+        options_count: Number of options per string
+
+    Returns:
+        One independent list of options_count placeholders per string
+    """
+    return [[message] * options_count for _ in range(strings_count)]
+
+def _normalize_options(options: List[Any], strings_count: int, options_count: int) -> List[List[str]]:
+    """
+    Validate the option lists returned by the model and coerce them to the expected shape.
+
+    Args:
+        options: Option lists as returned by the model, one per string
+        strings_count: Number of strings that were sent for translation
+        options_count: Number of options expected per string
+
+    Returns:
+        List of at least strings_count lists holding options_count string options each
+    """
+    normalized = [_normalize_option_list(opts, i, options_count) for i, opts in enumerate(options)]
+
+    # Ensure we have the right number of strings
+    if len(normalized) < strings_count:
+        logger.warning(f"Got {len(normalized)} translations but expected {strings_count}. Padding with empty translations.")
+        normalized.extend([_TRANSLATION_ERROR] * options_count for _ in range(strings_count - len(normalized)))
+
+    return normalized
+
+def _normalize_option_list(opts: Any, index: int, options_count: int) -> List[str]:
+    """
+    Coerce the options for one string to exactly options_count strings.
+
+    Args:
+        opts: Options returned by the model for the string
+        index: Position of the string in the batch (for log messages)
+        options_count: Number of options expected
+
+    Returns:
+        List of options_count options, padded with the first option or truncated as needed
+    """
+    if not isinstance(opts, list):
+        logger.warning(f"Invalid option format for string {index}. Expected list. Got: {type(opts)}")
+        return ["Error: Invalid option format"] * options_count
+
+    if len(opts) < options_count:
+        logger.warning(f"Got {len(opts)} options for string {index}, expected {options_count}. Padding with duplicates.")
+    elif len(opts) > options_count:
+        logger.warning(f"Got {len(opts)} options for string {index}, expected {options_count}. Truncating.")
+
+    # Validate each option is a string, then pad with the first option if short
+    normalized = [str(opt) if opt is not None else _TRANSLATION_ERROR for opt in opts[:options_count]]
+    if len(normalized) < options_count:
+        normalized += [normalized[0] if normalized else _TRANSLATION_ERROR] * (options_count - len(normalized))
+    return normalized
+
+def _options_cache_key(
+    string: str,
+    language: str,
+    model: str,
+    options_count: int,
+    project_context: Optional[str]
+) -> str:
+    """Build the LLM cache key for the options of one string in one language."""
+    return LLMCache.make_key("generate_options", string, language, model, options_count, project_context)
+
+def _is_cacheable(options: List[str]) -> bool:
+    """Check that a list of options holds real translations rather than error placeholders."""
+    return not any(option.startswith(_ERROR_OPTION_PREFIXES) for option in options)
 
 def save_options_to_files(options: Dict[str, Dict[str, Dict[str, List[str]]]], output_dir: str) -> None:
     """
@@ -270,7 +678,7 @@ def save_options_to_files(options: Dict[str, Dict[str, Dict[str, List[str]]]], o
         output_dir: Directory to save the option files
     """
     # Create directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     
     # Save to JSON file
     for filename, paths in options.items():
@@ -278,7 +686,7 @@ def save_options_to_files(options: Dict[str, Dict[str, Dict[str, List[str]]]], o
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(paths, f, ensure_ascii=False, indent=2)
         
-        print(f"Saved translation options for {filename}")
+        logger.info(f"Saved translation options for {filename}")
 
 # Example usage (for testing)
 if __name__ == "__main__":
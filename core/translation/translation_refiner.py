@@ -7,11 +7,32 @@ import os
 import csv
 import json
 import copy
+import logging
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 
 # Import the user-provided OpenAI wrapper and context configuration
-from utils.api.util_call import call_openai
+from utils.api import batch_api
+from utils.api.util_call import cache_openai_response, call_openai
+from utils.serialization import fast_json, zstd_jsonl
+from core.json.json_extractor import extract_strings_from_json
+from core.json.json_generator import get_language_name
 from utils.config.context_configuration import get_system_prompt
+from utils.filesystem.directories import ensure_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Maximum number of refinement batches sent to the API at the same time, per file and language
+MAX_CONCURRENT_BATCHES = 8
+
+# Maximum number of files and languages refined at the same time
+MAX_CONCURRENT_TASKS = 4
+
+# Estimated token budget for the items serialized into one refinement request
+MAX_BATCH_TOKENS = 6000
 
 
 def refine_translations(
@@ -22,7 +43,9 @@ def refine_translations(
         output_dir: str,
         project_context: str = None,
         batch_size: int = 50,
-        mock_mode: bool = False
+        mock_mode: bool = False,
+        use_batch_api: bool = False,
+        compress_output: bool = False
 ) -> Dict[str, Dict[str, Dict[str, str]]]:
     """
     Refine the selected translations for improved quality and consistency.
@@ -35,8 +58,14 @@ def refine_translations(
         model: Model to use for refining translations
         output_dir: Directory to save refined translations CSV files
         project_context: Custom project context (or None to use default)
-        batch_size: Number of strings to process in each batch
+        batch_size: Maximum number of strings to process in each batch; batches
+                    are also cut early to stay within MAX_BATCH_TOKENS
         mock_mode: Whether to run in mock mode without API calls
+        use_batch_api: Whether to submit all batches as one OpenAI Batch API job
+                       (cheaper, but results can take up to 24 hours)
+        compress_output: Whether to save refinements as zstd-compressed JSON Lines
+                         ({file}_{language}_refined.jsonl.zst) instead of CSV;
+                         requires the zstandard package
 
     Returns:
         Dictionary mapping filenames to dictionaries mapping languages to
@@ -44,6 +73,10 @@ def refine_translations(
     """
     refined = {}
 
+    if compress_output and not zstd_jsonl.AVAILABLE:
+        logger.warning("zstandard is not installed; saving refined translations as CSV")
+        compress_output = False
+
     # If mock mode is enabled, use the selected translations as-is without refinement
     if mock_mode:
         refined = copy.deepcopy(selected)
@@ -51,7 +84,7 @@ def refine_translations(
         # Save refined translations to file if output directory is provided
         if output_dir:
             # Create directory if it doesn't exist
-            os.makedirs(output_dir, exist_ok=True)
+            ensure_dir(output_dir)
             
             # Save to JSON file
             for filename, paths in refined.items():
@@ -61,21 +94,36 @@ def refine_translations(
         
         return refined
 
+    # (filename, language, output path, batches, unchanged translations) for every
+    # language that still needs refining
+    pending = []
+
+    # Original strings by dotted path, flattened once per file
+    originals_by_file = {}
+
     for filename, lang_selections in selected.items():
         refined[filename] = {}
+        originals = originals_by_file[filename] = extract_strings_from_json(original_jsons[filename])
         
         for language in languages:
             # Skip if this language wasn't processed
             if language not in lang_selections:
-                print(f"Skipping language {language} (no selections available)")
+                logger.info(f"Skipping language {language} (no selections available)")
                 continue
                 
-            # Check if output file exists
-            csv_path = os.path.join(
-                output_dir, f"{filename}_{language}_refined.csv"
-            )
+            # Check if output file exists (compressed JSON Lines or CSV)
+            base_path = os.path.join(output_dir, f"{filename}_{language}_refined")
+            zst_path = base_path + zstd_jsonl.EXTENSION
+            csv_path = base_path + ".csv"
+            if zstd_jsonl.AVAILABLE and os.path.exists(zst_path):
+                logger.info(f"Loading existing refinements for {language} in {filename}")
+                refined[filename][language] = {
+                    record["path"]: record["refined"] for record in zstd_jsonl.read_records(zst_path)
+                }
+                continue
+
             if os.path.exists(csv_path):
-                print(f"Loading existing refinements for {language} in {filename}")
+                logger.info(f"Loading existing refinements for {language} in {filename}")
                 
                 # Load existing refinements
                 if language not in refined[filename]:
@@ -91,80 +139,231 @@ def refine_translations(
                 
                 continue
 
-            # Prepare data for refinement
+            # Prepare data for refinement; pairs with an empty or non-string original or
+            # translation are passed through unchanged instead of being sent to the model
             refinement_data = []
+            unchanged = {}
             for path, translation in lang_selections[language].items():
-                # Get original string
-                original = ""
-                components = path.split('.')
-                obj = original_jsons[filename]
-                try:
-                    for comp in components:
-                        obj = obj[comp]
-                    if isinstance(obj, str):
-                        original = obj
-                except (KeyError, TypeError):
-                    pass
-                
-                refinement_data.append({
-                    "path": path,
-                    "original": original,
-                    "translation": translation
-                })
-            
-            # Process in batches
-            if language not in refined[filename]:
-                refined[filename][language] = {}
-                
-            for i in range(0, len(refinement_data), batch_size):
-                batch = refinement_data[i:i + batch_size]
-                
-                # Refine this batch
-                batch_refined = _refine_batch(batch, language, model, filename, project_context)
-                
-                # Store refined translations
-                for item in batch_refined:
-                    refined[filename][language][item["path"]] = item["refined"]
-                
-                print(
-                    f"Refined batch {i // batch_size + 1}/{(len(refinement_data) - 1) // batch_size + 1} for {language} in {filename}")
-            
-            # Save refined translations to CSV
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(["Path", "Original", "Refined Translation"])
-                
-                for path, translation in refined[filename][language].items():
-                    # Get original string
-                    original = ""
-                    components = path.split('.')
-                    obj = original_jsons[filename]
-                    try:
-                        for comp in components:
-                            obj = obj[comp]
-                        if isinstance(obj, str):
-                            original = obj
-                    except (KeyError, TypeError):
-                        pass
-                    
-                    writer.writerow([path, original, translation])
+                original = originals.get(path, "")
+                if (isinstance(original, str) and isinstance(translation, str)
+                        and original.strip() and translation.strip()):
+                    refinement_data.append({"path": path, "original": original, "translation": translation})
+                else:
+                    unchanged[path] = translation
+            if unchanged:
+                logger.info(f"Passing through {len(unchanged)} empty strings for {language} in {filename}")
             
-            print(f"Saved refined translations for {language} in {filename}")
-    
+            # Split into batches; they are refined once every file and language is collected
+            batches = _pack_batches(refinement_data, batch_size)
+            output_path = zst_path if compress_output else csv_path
+            pending.append((filename, language, output_path, batches, unchanged))
+
+    # Submit every batch as a single Batch API job when requested
+    batch_api_results = {}
+    if use_batch_api and pending:
+        batch_api_results = _refine_with_batch_api(pending, model, project_context)
+
+    # Refine each file and language in parallel; the work is dominated by API round-trips
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENT_TASKS, len(pending)))) as executor:
+        futures = {
+            (filename, language): executor.submit(
+                _refine_file_language,
+                filename,
+                language,
+                output_path,
+                batches,
+                unchanged,
+                originals_by_file[filename],
+                model,
+                project_context,
+                batch_api_results
+            )
+            for filename, language, output_path, batches, unchanged in pending
+        }
+    for (filename, language), future in futures.items():
+        refined[filename][language] = future.result()
+
     return refined
 
 
-def _get_value_at_path(json_data: Dict, path: str) -> Any:
-    """Get a value from a nested dictionary using a dot-separated path."""
+def _refine_file_language(
+        filename: str,
+        language: str,
+        output_path: str,
+        batches: List[List[Dict]],
+        unchanged: Dict[str, str],
+        originals: Dict[str, str],
+        model: str,
+        project_context: str,
+        batch_api_results: Dict[str, str]
+) -> Dict[str, str]:
+    """
+    Refine all batches for one file and language and save them to disk.
+
+    Args:
+        filename: Name of the file being processed
+        language: Target language
+        output_path: Path of the refined translations file to write (.csv or .jsonl.zst)
+        batches: Batches of refinement items
+        unchanged: Translations by path that are saved without refinement
+        originals: Original strings by path for the file
+        model: Model to use for refinement
+        project_context: Custom project context (or None to use default)
+        batch_api_results: Batch API responses by custom ID (may be empty)
+
+    Returns:
+        Dictionary mapping paths to refined translations
+    """
+    system_prompt = _build_refine_system_prompt(language, project_context)
+
+    # Refine batches concurrently - each one is a network round-trip - and
+    # store the results in batch order; Batch API results are reused where available
+    def refine(indexed_batch):
+        i, batch = indexed_batch
+        response_text = batch_api_results.get(_batch_custom_id(filename, language, i))
+        if response_text is not None:
+            refined = _parse_refine_response(response_text, batch)
+            return refined if refined is not None else _original_translations(batch)
+        return _refine_batch(batch, language, model, filename, project_context, system_prompt)
+
+    # Write rows as batches complete; the output only replaces the final path once every
+    # batch is done, so an interrupted run is not mistaken for a finished one on resume
+    partial_path = output_path + ".partial"
+    language_refined = dict(unchanged)
+    with _open_refined_writer(partial_path, output_path.endswith(zstd_jsonl.EXTENSION)) as (write_row, flush):
+        for path, translation in unchanged.items():
+            write_row(path, originals.get(path, ""), translation)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_CONCURRENT_BATCHES, len(batches)))) as executor:
+            for batch_number, batch_refined in enumerate(executor.map(refine, enumerate(batches)), 1):
+                # Store and save refined translations
+                for item in batch_refined:
+                    language_refined[item["path"]] = item["refined"]
+                    write_row(item["path"], originals.get(item["path"], ""), item["refined"])
+                flush()
+
+                logger.debug(f"Refined batch {batch_number}/{len(batches)} for {language} in {filename}")
+
+    os.replace(partial_path, output_path)
+    logger.info(f"Saved refined translations for {language} in {filename}")
+
+    return language_refined
+
+
+@contextlib.contextmanager
+def _open_refined_writer(path: str, compressed: bool):
+    """
+    Open a refined translations file for writing.
+
+    Args:
+        path: Path of the file to write
+        compressed: Whether to write compressed JSON Lines instead of CSV
+
+    Yields:
+        Tuple of a function writing one (path, original, refined) row and a
+        function flushing the rows written so far to disk
+    """
+    if compressed:
+        with zstd_jsonl.JsonlZstWriter(path) as writer:
+            yield (
+                lambda key, original, translation: writer.write(
+                    {"path": key, "original": original, "refined": translation}
+                ),
+                writer.flush
+            )
+        return
+
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["Path", "Original", "Refined Translation"])
+        yield (
+            lambda key, original, translation: writer.writerow([key, original, translation]),
+            csvfile.flush
+        )
+
+
+def _pack_batches(items: List[Dict], batch_size: int) -> List[List[Dict]]:
+    """
+    Split refinement items into batches by estimated token count as well as by item count.
+
+    Args:
+        items: Refinement items (path, original, translation), in order
+        batch_size: Maximum number of items per batch
+
+    Returns:
+        List of batches; an item that exceeds the budget on its own gets a batch to itself
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    for item in items:
+        # The item is sent as JSON and the refined translation comes back once
+        tokens = _estimate_tokens(fast_json.dumps(item)) + _estimate_tokens(item["translation"])
+        if current and (len(current) >= batch_size or current_tokens + tokens > MAX_BATCH_TOKENS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a string (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _refine_with_batch_api(
+        pending: List[tuple],
+        model: str,
+        project_context: str = None
+) -> Dict[str, str]:
+    """
+    Refine every pending batch through a single OpenAI Batch API job.
+
+    Args:
+        pending: (filename, language, output path, batches, unchanged translations)
+                 tuples still to be refined
+        model: Model to use for refinement
+        project_context: Custom project context (or None to use default)
+
+    Returns:
+        Dictionary mapping batch custom IDs to response texts; empty if the job
+        did not complete, so that every batch falls back to a direct API call
+    """
+    system_prompts = {
+        language: _build_refine_system_prompt(language, project_context)
+        for language in {task[1] for task in pending}
+    }
+    requests = [
+        batch_api.build_request(
+            _batch_custom_id(filename, language, i),
+            _build_refine_prompt(batch, language, filename, project_context, system_prompts[language]),
+            model
+        )
+        for filename, language, _, batches, _ in pending
+        for i, batch in enumerate(batches)
+    ]
+    if not requests:
+        return {}
+
     try:
-        current = json_data
-        for p in path.split('.'):
-            if p.isdigit():
-                p = int(p)
-            current = current[p]
-        return current
-    except (KeyError, IndexError, TypeError):
-        return f"Error: Could not retrieve value at path {path}"
+        batch_id = batch_api.submit_batch(requests)
+        batch = batch_api.wait_for_batch(batch_id)
+        if batch.status != "completed":
+            logger.warning(f"Batch job {batch_id} ended with status {batch.status}; falling back to direct API calls")
+            return {}
+        return batch_api.parse_results(batch)
+    except Exception as e:
+        logger.warning(f"Error running batch job: {str(e)}; falling back to direct API calls")
+        return {}
+
+
+def _batch_custom_id(filename: str, language: str, index: int) -> str:
+    """Build the Batch API custom ID for one refinement batch."""
+    return f"{filename}|{language}|{index}"
 
 
 def _refine_batch(
@@ -172,7 +371,8 @@ def _refine_batch(
         language: str,
         model: str,
         filename: str,
-        project_context: str = None
+        project_context: str = None,
+        system_prompt: Optional[str] = None
 ) -> List[Dict]:
     """
     Refine a batch of translations.
@@ -183,26 +383,59 @@ def _refine_batch(
         model: Model to use for refinement
         filename: Name of the file being processed (for context)
         project_context: Custom project context (or None to use default)
+        system_prompt: Prebuilt system prompt for the language (optional)
 
     Returns:
         List of dictionaries containing paths and refined translations
 
+    Raises:
+        ValueError: If batch is empty or invalid
+    """
+    technical_prompt = _build_refine_prompt(batch, language, filename, project_context, system_prompt)
+
+    try:
+        response_text = call_openai(prompt=technical_prompt, model=model)
+    except Exception as e:
+        logger.warning(f"Error during refinement: {str(e)}")
+        # Fallback to original translations
+        return _original_translations(batch)
+
+    refined = _parse_refine_response(response_text, batch)
+    if refined is None:
+        return _original_translations(batch)
+
+    # Only a usable reply is cached, so a bad one is requested again on the next run
+    cache_openai_response(technical_prompt, response_text, model)
+    return refined
+
+
+def _build_refine_prompt(
+        batch: List[Dict],
+        language: str,
+        filename: str,
+        project_context: str = None,
+        system_prompt: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the prompt for refining a batch of translations.
+
+    Args:
+        batch: List of dictionaries with translations to refine
+        language: Target language
+        filename: Name of the file being processed (for context)
+        project_context: Custom project context (or None to use default)
+        system_prompt: Prebuilt system prompt for the language (optional)
+
+    Returns:
+        Structured prompt for call_openai
+
     Raises:
         ValueError: If batch is empty or invalid
     """
     if not batch:
         raise ValueError("batch cannot be empty")
 
-    # Get language name from language code by loading languages.json
-    try:
-        with open("data/languages.json", "r", encoding="utf-8") as f:
-            language_data = json.load(f)
-            # Swap keys and values to get a mapping from code to name
-            code_to_name = {code: name for name, code in language_data.items()}
-            language_name = code_to_name.get(language, language)
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Fallback to just using the language code
-        language_name = language
+    language_name = get_language_name(language)
 
     # Validate batch data structure
     for i, item in enumerate(batch):
@@ -213,76 +446,108 @@ def _refine_batch(
         if not isinstance(item["translation"], str):
             raise ValueError(f"Invalid translation type at index {i}: expected str, got {type(item['translation'])}")
 
+    if system_prompt is None:
+        system_prompt = _build_refine_system_prompt(language, project_context)
+
+    # Everything before the batch JSON is identical for every batch of a file and language,
+    # so the provider's prompt cache can reuse it; keep per-batch content at the end
+    user_prefix = f"Please refine the following {language_name} ({language}) translations and provide your response in JSON format:\nFile: {filename}\n"
+
+    # Build the prompt for the wrapper function; the schema constrains the reply shape
+    technical_prompt = {
+        "system": system_prompt,
+        "user": user_prefix + fast_json.dumps(batch),
+        "response_format": _refine_response_format(len(batch))
+    }
+
+    return technical_prompt
+
+
+def _build_refine_system_prompt(language: str, project_context: str = None) -> str:
+    """
+    Build the refinement system prompt for a language.
+
+    Args:
+        language: Target language
+        project_context: Custom project context (or None to use default)
+
+    Returns:
+        System prompt for refinement requests in the language
+    """
+    language_name = get_language_name(language)
+
     # Get the appropriate system prompt using the project context
-    system_prompt = get_system_prompt(
+    return get_system_prompt(
         "refine_translations",
         language=language_name,
         project_context=project_context
     ) + f"\nRespond with a JSON object containing a 'refined_translations' array of improved {language_name} translations."
 
-    # Use the provided wrapper function with simplified response format
-    technical_prompt = {
-        "system": system_prompt,
-        "user": f"Please refine the following {language_name} ({language}) translations and provide your response in JSON format:\nFile: {filename}\n{json.dumps(batch, indent=2)}",
-        "response_format": {"type": "json_object"}
-    }
 
+def _parse_refine_response(response_text: str, batch: List[Dict]) -> Optional[List[Dict]]:
+    """
+    Parse a refinement response into refined translations.
+
+    Args:
+        response_text: Raw response text from the model
+        batch: The batch of translations that was sent for refinement
+
+    Returns:
+        List of dictionaries containing paths and refined translations, or None
+        if the response cannot be used
+    """
     try:
-        response_text = call_openai(prompt=technical_prompt, model=model)
-        print(f"Raw refinement response: {response_text[:200]}...")  # Debug output
-        
-        response_data = json.loads(response_text)
-        
-        if "refined_translations" not in response_data:
-            print("Missing 'refined_translations' in response")
-            # Fallback to original translations
-            return [{"path": item["path"], "refined": item["translation"]} for item in batch]
-            
-        refined = response_data["refined_translations"]
-        
-        if not isinstance(refined, list):
-            print(f"Invalid refined_translations format. Expected list, got {type(refined)}")
-            return [{"path": item["path"], "refined": item["translation"]} for item in batch]
-        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Raw refinement response: {response_text[:200]}...")  # Log first 200 chars for debugging
+
+        # The response schema fixes the shape, so only the count needs checking
+        refined = fast_json.loads(response_text)["refined_translations"]
         if len(refined) != len(batch):
-            print(f"Mismatch in refined translations count. Expected {len(batch)}, got {len(refined)}")
-            return [{"path": item["path"], "refined": item["translation"]} for item in batch]
-        
-        # Process refined translations, handling both string and dictionary formats
-        result = []
-        for i, (item, refined_item) in enumerate(zip(batch, refined)):
-            if isinstance(refined_item, dict) and "translation" in refined_item:
-                # Format where each refined item is a dictionary with a "translation" field
-                result.append({"path": item["path"], "refined": str(refined_item["translation"])})
-            elif isinstance(refined_item, dict) and "refined" in refined_item:
-                # Format where each refined item is a dictionary with a "refined" field
-                result.append({"path": item["path"], "refined": str(refined_item["refined"])})
-            elif isinstance(refined_item, dict) and "refined_translation" in refined_item:
-                # Format where each refined item is a dictionary with a "refined_translation" field
-                result.append({"path": item["path"], "refined": str(refined_item["refined_translation"])})
-            elif isinstance(refined_item, dict) and "path" in refined_item and any(key in refined_item for key in ["translation", "refined", "refined_translation"]):
-                # Format where each refined item has both path and translation
-                for key in ["translation", "refined", "refined_translation"]:
-                    if key in refined_item:
-                        result.append({"path": refined_item["path"], "refined": str(refined_item[key])})
-                        break
-                else:
-                    # If we didn't find a translation, use the original
-                    result.append({"path": item["path"], "refined": item["translation"]})
-            elif isinstance(refined_item, str):
-                # Format where each refined item is just a string
-                result.append({"path": item["path"], "refined": refined_item})
-            else:
-                # Fallback to original translation
-                print(f"Unrecognized format for refined item {i}: {refined_item}")
-                result.append({"path": item["path"], "refined": item["translation"]})
-                
-        return result
-        
+            raise ValueError(f"Expected {len(batch)} refined translations, got {len(refined)}")
+
+        return [{"path": item["path"], "refined": str(refined_item)} for item, refined_item in zip(batch, refined)]
+
     except Exception as e:
-        print(f"Error during refinement: {str(e)}")
-        # Fallback to original translations
-        return [{"path": item["path"], "refined": item["translation"]} for item in batch]
+        logger.warning(f"Error during refinement: {str(e)}")
+        return None
+
+
+def _original_translations(batch: List[Dict]) -> List[Dict]:
+    """Fall back to the unrefined translations of a batch."""
+    return [{"path": item["path"], "refined": item["translation"]} for item in batch]
+
+
+@functools.lru_cache(maxsize=None)
+def _refine_response_format(count: int) -> Dict[str, Any]:
+    """
+    Build the structured-output response format for a refinement request.
+
+    Args:
+        count: Number of translations in the batch
+
+    Returns:
+        response_format value restricting the reply to {"refined_translations": [str, ...]}
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "refinements",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "refined_translations": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": count,
+                        "maxItems": count
+                    }
+                },
+                "required": ["refined_translations"],
+                "additionalProperties": False
+            }
+        }
+    }
 
 
 # Example usage (for testing)
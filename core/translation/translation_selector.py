@@ -9,8 +9,10 @@ import json
 from typing import Dict, List, Any, Optional
 
 # Import the user-provided OpenAI wrapper and context configuration
-from utils.api.util_call import call_openai
+from utils.api.util_call import cache_openai_response, call_openai
 from utils.config.context_configuration import get_system_prompt
+from core.json.json_extractor import extract_strings_from_json
+from utils.filesystem.directories import ensure_dir
 
 
 def select_best_translations(
@@ -57,7 +59,7 @@ def select_best_translations(
         # Save selections to file if output directory is provided
         if output_dir:
             # Create directory if it doesn't exist
-            os.makedirs(output_dir, exist_ok=True)
+            ensure_dir(output_dir)
             
             # Save to JSON file
             for filename, paths in selections.items():
@@ -70,6 +72,9 @@ def select_best_translations(
     for filename, path_options in options.items():
         selections[filename] = {}
 
+        # Original strings by dotted path, flattened once per file
+        originals = extract_strings_from_json(json_files.get(filename, {}))
+
         # Prepare selection data
         path_items = list(path_options.items())
 
@@ -112,7 +117,7 @@ def select_best_translations(
                     selection_data, 
                     language, 
                     model, 
-                    json_files[filename],
+                    originals,
                     project_context
                 )
 
@@ -147,41 +152,16 @@ def select_best_translations(
                 writer = csv.writer(csvfile)
                 writer.writerow(["Path", "Original", "Selected Translation"])
 
-                for path, translations in selections[filename][language].items():
-                    original = ""
-                    # Find original text from options dictionary
-                    if filename in json_files and path in path_options:
-                        # Extract original text by traversing the JSON using path components
-                        components = path.split('.')
-                        obj = json_files[filename]
-                        try:
-                            for comp in components:
-                                obj = obj[comp]
-                            if isinstance(obj, str):
-                                original = obj
-                        except (KeyError, TypeError):
-                            pass
-
-                    writer.writerow([path, original, translations])
+                writer.writerows(
+                    [path, originals.get(path, "") if path in path_options else "", translations]
+                    for path, translations in selections[filename][language].items()
+                )
 
             print(f"Saved selected translations for {language} in {filename}")
 
     return selections
 
 
-def _get_value_at_path(json_data: Dict, path: str) -> Any:
-    """Get a value from a nested dictionary using a dot-separated path."""
-    try:
-        current = json_data
-        for p in path.split('.'):
-            if p.isdigit():
-                p = int(p)
-            current = current[p]
-        return current
-    except (KeyError, IndexError, TypeError):
-        return f"Error: Could not retrieve value at path {path}"
-
-
 def _select_best_batch(
         batch_data: List[Dict[str, Any]],
         language: str,
@@ -251,6 +231,9 @@ def _select_best_batch(
             print(f"Mismatch in selections count. Expected {len(batch_data)}, got {len(selections)}")
             return [item["options"][0] for item in batch_data]
             
+        # Only a usable reply is cached, so a bad one is requested again on the next run
+        cache_openai_response(technical_prompt, response_text, model)
+        
         # Return selections in order
         return [str(selection) for selection in selections]
 
@@ -263,7 +246,7 @@ def _select_best_translations(
     selection_data: List[Dict[str, Any]],
     language: str,
     model: str,
-    json_data: Dict,
+    originals: Dict[str, str],
     project_context: str = None
 ) -> List[Dict[str, Any]]:
     """
@@ -273,7 +256,7 @@ def _select_best_translations(
         selection_data: List of dictionaries containing paths and translation options
         language: Target language
         model: Model to use for selection
-        json_data: Original JSON data for context
+        originals: Original strings by dotted path, for context
         project_context: Custom project context
         
     Returns:
@@ -285,10 +268,9 @@ def _select_best_translations(
         path = item["path"]
         options = item["options"]
         
-        # Get original text by traversing the JSON using path components
-        original = _get_value_at_path(json_data, path)
-        if not isinstance(original, str):
-            original = str(original)
+        original = originals.get(path)
+        if original is None:
+            original = f"Error: Could not retrieve value at path {path}"
             
         batch_data.append({
             "path": path,
@@ -9,8 +9,9 @@ import random
 from typing import Dict, List, Any, Tuple, Optional
 
 # Import the user-provided OpenAI wrapper and context configuration
-from utils.api.util_call import call_openai
+from utils.api.util_call import cache_openai_response, call_openai
 from utils.config.context_configuration import get_system_prompt
+from utils.filesystem.directories import ensure_dir
 
 def get_language_name(language_code: str) -> str:
     """Get the full language name from a language code by loading languages.json."""
@@ -121,7 +122,7 @@ def validate_translations(
                 
                 # Save validation results to file if requested
                 if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
+                    ensure_dir(output_dir)
                     result_path = os.path.join(
                         output_dir, 
                         f"{os.path.splitext(filename)[0]}_{language}_validation.json"
@@ -444,6 +445,9 @@ def _validate_translation_batch(
                 raise ValueError(f"Invalid score type at index {i}: expected number, got {type(score)}")
             if not 0 <= score <= 100:
                 raise ValueError(f"Score out of range at index {i}: {score}")
+        
+        # Only a usable reply is cached, so a bad one is requested again on the next run
+        cache_openai_response(technical_prompt, response_text, model)
 
         # Process details
         details = []
@@ -4,12 +4,11 @@ This class coordinates all steps of the pipeline from extraction to validation.
 """
 
 import os
-import json
 import datetime
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from tqdm import tqdm
 
 from utils.config.config import get_output_dirs, Config
@@ -22,6 +21,7 @@ from core.translation.translation_validator import validate_translations
 from utils.reporting.report_generator import generate_summary_report
 from utils.config.context_generator import generate_context_configuration
 from utils.logging.logging_config import model_usage
+from utils.serialization import fast_json
 
 
 class TranslationPipeline:
@@ -72,11 +72,10 @@ class TranslationPipeline:
         
         # Load JSON file
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
-                if not isinstance(json_data, dict):
-                    raise ValueError("JSON root must be an object")
-                json_files = {file_name: json_data}
+            json_data = fast_json.load_file(file_path)
+            if not isinstance(json_data, dict):
+                raise ValueError("JSON root must be an object")
+            json_files = {file_name: json_data}
         except Exception as e:
             logging.error(f"Error loading {file_name}: {str(e)}")
             raise
@@ -180,7 +179,9 @@ class TranslationPipeline:
                 self.output_dirs["refined"],
                 self.project_context,
                 batch_size=self.config.batch_size,
-                mock_mode=self.config.mock_mode
+                mock_mode=self.config.mock_mode,
+                use_batch_api=self.config.use_batch_api,
+                compress_output=self.config.compress_refined
             )
             refined.update(lang_refined)
             
@@ -250,7 +251,8 @@ class TranslationPipeline:
                 "refinement": self.config.refinement_model,
                 "validation": self.config.validation_model
             },
-            self.output_dirs["logs"]
+            self.output_dirs["logs"],
+            pretty=self.config.pretty_report
         )
         
         end_time = datetime.datetime.now()
@@ -267,10 +269,9 @@ class TranslationPipeline:
             Dictionary with validation results for all files
         """
         all_results = {}
-        input_path = Path(self.config.input_dir)
         
         # Find all JSON files
-        json_files = list(input_path.glob("**/*.json"))
+        json_files = [Path(path) for path in self._find_json_files(self.config.input_dir)]
         if not json_files:
             logging.warning(f"No JSON files found in {self.config.input_dir}")
             return {}
@@ -319,4 +320,25 @@ class TranslationPipeline:
                 elif isinstance(item, (dict, list)):
                     values.extend(TranslationPipeline._extract_all_values(item))
         
-        return values 
\ No newline at end of file
+        return values 
+    
+    @staticmethod
+    def _find_json_files(root: str) -> Iterator[str]:
+        """
+        Recursively find JSON files with os.scandir, skipping hidden directories.
+        
+        Args:
+            root: Directory to search
+            
+        Returns:
+            Iterator over the paths of the JSON files found
+        """
+        stack = [root]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.json'):
+                        yield entry.path
@@ -14,10 +14,16 @@ class ValidationVisualizer:
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.current_report_dir = os.path.join(self.reports_dir, f"report_{self.run_id}")
         os.makedirs(self.current_report_dir, exist_ok=True)
+        # Parsed validation files, shared by every report this visualizer generates
+        self._validation_cache: Dict[str, Dict] = {}
 
     def _load_validation_data(self, validation_file: str) -> Dict:
-        with open(validation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        data = self._validation_cache.get(validation_file)
+        if data is None:
+            with open(validation_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._validation_cache[validation_file] = data
+        return data
 
     def _create_score_histogram(self, scores: List[float], title: str, filename: str):
         plt.figure(figsize=(10, 6))
@@ -22,14 +22,11 @@ from openai import OpenAI
 from core.json.json_extractor import process_json_files
 from core.json.json_generator import generate_translated_jsons, load_language_codes
 from utils.validation.validation import run_preflight_checks
-from utils.api.util_call import call_openai
+from utils.api.util_call import cache_openai_response, call_openai
+from utils.logging.logging_config import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+setup_logging()
 logger = logging.getLogger("json_translator")
 
 def parse_args():
@@ -43,6 +40,7 @@ def parse_args():
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
     parser.add_argument("--mock", action="store_true", help="Run in mock mode without API calls")
     parser.add_argument("--check-only", action="store_true", help="Run only preflight checks without translation")
+    parser.add_argument("--verify-api", action="store_true", help="Test OpenAI API access with a real request during preflight checks")
     parser.add_argument("--batch-size", type=int, default=10, help="Number of strings to translate in each batch")
     return parser.parse_args()
 
@@ -176,6 +174,10 @@ def translate_strings(strings: Dict[str, str], language: str, model: str, batch_
             # Map translations back to paths
             for path, translation in zip(batch_paths, batch_translations):
                 translations[path] = translation
+            
+            # Only a complete reply is cached, so a bad one is requested again on the next run
+            if isinstance(batch_translations, list) and len(batch_translations) == len(batch_paths):
+                cache_openai_response(prompt, response, model)
                 
         except Exception as e:
             logger.error(f"Error translating batch: {str(e)}")
@@ -204,7 +206,7 @@ def main():
     
     # Run preflight checks
     logger.info("Running preflight checks...")
-    checks_passed = run_preflight_checks(args.source, args.output)
+    checks_passed = run_preflight_checks(args.source, args.output, verify_api=args.verify_api)
     if not checks_passed:
         logger.error("Preflight checks failed. Please fix the issues and try again.")
         return 1
@@ -11,18 +11,12 @@ import sys
 import argparse
 import logging
 from typing import List
-from utils.config.config import Config
-from core.translation_pipeline import TranslationPipeline
-from dotenv import load_dotenv
-from utils.validation.validation import run_preflight_checks
 import time
 
+from utils.logging.logging_config import setup_logging
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+setup_logging()
 logger = logging.getLogger("translation_pipeline")
 
 def parse_args():
@@ -42,6 +36,10 @@ def parse_args():
                         help="Number of translation options to generate")
     parser.add_argument("--batch-size", type=int, default=20, 
                         help="Number of strings to translate in each batch")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="Refine translations through the OpenAI Batch API (cheaper, but can take hours)")
+    parser.add_argument("--compress-refined", action="store_true",
+                        help="Save refined translations as zstd-compressed JSON Lines instead of CSV")
     parser.add_argument("--project-description", 
                         help="Description of the project for context generation")
     parser.add_argument("--regenerate-context", action="store_true", 
@@ -66,6 +64,10 @@ def parse_args():
                         help="Enable debug logging")
     parser.add_argument("--mock", action="store_true",
                         help="Run in mock mode without making real API calls")
+    parser.add_argument("--verify-api", action="store_true",
+                        help="Test OpenAI API access with a real request during preflight checks")
+    parser.add_argument("--pretty-report", action="store_true",
+                        help="Also write an indented copy of the JSON summary report")
     
     return parser.parse_args()
 
@@ -79,6 +81,8 @@ def create_config_from_args(args):
     Returns:
         Config object
     """
+    from utils.config.config import Config
+    
     # Create the base Config object
     config = Config()
     
@@ -90,6 +94,8 @@ def create_config_from_args(args):
     # Set processing settings
     config.options_count = args.options_count
     config.batch_size = args.batch_size
+    config.use_batch_api = args.batch_api
+    config.compress_refined = args.compress_refined
     
     # Set context settings
     if args.project_description:
@@ -113,6 +119,9 @@ def create_config_from_args(args):
     # Set mock mode if requested
     config.mock_mode = args.mock
     
+    # Set report options
+    config.pretty_report = args.pretty_report
+    
     return config
 
 def main():
@@ -120,6 +129,11 @@ def main():
     # Parse command line arguments
     args = parse_args()
     
+    # Import the pipeline only after argument parsing so --help stays fast
+    from dotenv import load_dotenv
+    from core.translation_pipeline import TranslationPipeline
+    from utils.validation.validation import run_preflight_checks
+    
     # Set logging level
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
@@ -168,13 +182,14 @@ def main():
         input_dir=config.input_dir,
         output_dir=config.output_dir,
         prompt_config=config.prompt_config_path,
-        mock_mode=config.mock_mode
+        mock_mode=config.mock_mode,
+        verify_api=args.verify_api
     ):
         logger.error("Preflight checks failed. Please fix the issues before proceeding.")
         return 1
     
-    # Add delay after preflight checks to avoid rate limits
-    if not config.mock_mode:
+    # Add delay after the preflight API test to avoid rate limits
+    if not config.mock_mode and args.verify_api:
         logger.info("Waiting 2 seconds before starting pipeline to avoid rate limits...")
         time.sleep(2)
     
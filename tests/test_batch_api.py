@@ -0,0 +1,93 @@
+"""
+Unit tests for the OpenAI Batch API helpers.
+"""
+
+import sys
+import json
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.api import batch_api
+
+
+def _result_line(custom_id, status_code, content=None, error=None):
+    """Build one line of a batch output file."""
+    body = {"choices": [{"message": {"content": content}}]} if content is not None else {}
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {"status_code": status_code, "body": body},
+        "error": error
+    })
+
+
+class TestBatchApi(unittest.TestCase):
+    """Test case for the Batch API helpers."""
+
+    def test_build_request(self):
+        """Structured prompts become chat completion request lines."""
+        prompt = {"system": "Be brief", "user": "Hi", "response_format": {"type": "json_object"}}
+        request = batch_api.build_request("file:es:0", prompt, "gpt-4o")
+
+        self.assertEqual(request["custom_id"], "file:es:0")
+        self.assertEqual(request["url"], "/v1/chat/completions")
+        self.assertEqual(request["body"], {
+            "model": "gpt-4o",
+            "messages": [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "Hi"}],
+            "response_format": {"type": "json_object"}
+        })
+
+    def test_build_request_without_optional_parts(self):
+        """Missing system prompts and response formats are left out."""
+        request = batch_api.build_request("id", {"user": "Hi"}, "gpt-4o")
+        self.assertEqual(request["body"], {"model": "gpt-4o", "messages": [{"role": "user", "content": "Hi"}]})
+
+    def test_submit_and_parse_results(self):
+        """Requests are uploaded as JSONL and successful results are keyed by custom ID."""
+        output = "\n".join([
+            _result_line("a", 200, "  first  "),
+            "",
+            _result_line("b", 500, error={"message": "server error"}),
+            _result_line("c", 200, "third")
+        ])
+        client = mock.Mock()
+        client.files.create.return_value = SimpleNamespace(id="file-1")
+        client.batches.create.return_value = SimpleNamespace(id="batch-1")
+        client.files.content.return_value = SimpleNamespace(text=output)
+
+        with mock.patch.object(batch_api, "get_llm_client", return_value=SimpleNamespace(client=client)):
+            requests = [batch_api.build_request(custom_id, {"user": "Hi"}, "gpt-4o") for custom_id in "abc"]
+            self.assertEqual(batch_api.submit_batch(requests), "batch-1")
+            results = batch_api.parse_results(SimpleNamespace(output_file_id="out-1"))
+
+        uploaded = client.files.create.call_args.kwargs["file"][1].decode("utf-8")
+        self.assertEqual([json.loads(line) for line in uploaded.splitlines()], requests)
+        self.assertEqual(results, {"a": "first", "c": "third"})
+
+    def test_parse_results_without_output(self):
+        """A batch without an output file yields no results."""
+        self.assertEqual(batch_api.parse_results(SimpleNamespace(output_file_id=None)), {})
+
+    def test_wait_for_batch(self):
+        """Polling stops at the first terminal status."""
+        client = mock.Mock()
+        client.batches.retrieve.side_effect = [
+            SimpleNamespace(status="validating"),
+            SimpleNamespace(status="in_progress"),
+            SimpleNamespace(status="completed")
+        ]
+
+        with mock.patch.object(batch_api, "get_llm_client", return_value=SimpleNamespace(client=client)), \
+                mock.patch.object(batch_api.time, "sleep") as sleep:
+            batch = batch_api.wait_for_batch("batch-1", poll_interval=5)
+
+        self.assertEqual(batch.status, "completed")
+        self.assertEqual(sleep.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
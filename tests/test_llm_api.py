@@ -0,0 +1,101 @@
+"""
+Unit tests for the LLM API wrapper.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from openai import APIStatusError
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.api import llm_api
+from utils.api.llm_api import JSON_OBJECT_FORMAT, LLMApi
+from utils.api.llm_cache import LLMCache
+
+SCHEMA_FORMAT = {"type": "json_schema", "json_schema": {"name": "reply", "strict": True, "schema": {}}}
+MESSAGES = [{"role": "system", "content": "Reply in JSON"}, {"role": "user", "content": "Hi"}]
+
+
+def _bad_request(message, param=None, code=None):
+    """Build an HTTP 400 error as raised by the OpenAI SDK."""
+    response = mock.Mock(status_code=400, headers={})
+    body = {"message": message, "type": "invalid_request_error", "param": param, "code": code}
+    return APIStatusError(message, response=response, body=body)
+
+
+def _reply(content):
+    """Build a chat completion response."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class TestJsonSchemaFallback(unittest.TestCase):
+    """Test case for the json_schema to JSON mode fallback."""
+
+    def setUp(self):
+        """Create a client with a mocked transport and no persistent cache."""
+        patcher = mock.patch.object(llm_api, "get_llm_cache", return_value=LLMCache(enabled=False))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.api = LLMApi(api_key="sk-test", model="test-model", max_retries=3, retry_delay=0)
+        self.create = mock.Mock()
+        self.api.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self.create)))
+
+    def _formats_sent(self):
+        return [call.kwargs.get("response_format") for call in self.create.call_args_list]
+
+    def test_schema_rejection_falls_back(self):
+        """A 400 naming response_format is retried once in JSON mode and remembered."""
+        self.create.side_effect = [
+            _bad_request("Invalid parameter: 'response_format' of type 'json_schema' is not supported "
+                         "with this model.", param="response_format"),
+            _reply(' {"ok": true} '),
+            _reply('{"ok": true}')
+        ]
+
+        self.assertEqual(self.api.call_structured_model(MESSAGES, SCHEMA_FORMAT), '{"ok": true}')
+        self.assertFalse(self.api.json_schema_supported)
+
+        # Later schema requests go straight to JSON mode
+        self.api.call_structured_model(MESSAGES, SCHEMA_FORMAT)
+        self.assertEqual(self._formats_sent(), [SCHEMA_FORMAT, JSON_OBJECT_FORMAT, JSON_OBJECT_FORMAT])
+
+    def test_schema_rejection_detected_from_message(self):
+        """A 400 without a param is still a schema rejection when it mentions json_schema."""
+        self.create.side_effect = [_bad_request("json_schema is not supported"), _reply("{}")]
+
+        self.assertEqual(self.api.call_structured_model(MESSAGES, SCHEMA_FORMAT), "{}")
+        self.assertFalse(self.api.json_schema_supported)
+
+    def test_unrelated_bad_request_raises(self):
+        """Other 400s fail without a retry and keep structured outputs enabled."""
+        self.create.side_effect = _bad_request(
+            "This model's maximum context length is 128000 tokens.",
+            param="messages", code="context_length_exceeded"
+        )
+
+        with self.assertRaises(Exception) as raised:
+            self.api.call_structured_model(MESSAGES, SCHEMA_FORMAT)
+
+        self.assertIn("non-retryable", str(raised.exception))
+        self.assertTrue(self.api.json_schema_supported)
+        self.assertEqual(self._formats_sent(), [SCHEMA_FORMAT])
+
+    def test_json_object_request_is_not_retried(self):
+        """Requests that did not use json_schema never fall back."""
+        self.create.side_effect = _bad_request("json_schema is not supported", param="response_format")
+
+        with self.assertRaises(Exception):
+            self.api.call_structured_model(MESSAGES, JSON_OBJECT_FORMAT)
+
+        self.assertEqual(self.create.call_count, 1)
+        self.assertTrue(self.api.json_schema_supported)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Unit tests for the persistent LLM caches.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import importlib
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.api import llm_cache, semantic_cache
+from utils.api.llm_cache import LLMCache
+from utils.api.semantic_cache import SemanticCache
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test case for the exact-match LLM cache."""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache", "llm_cache.sqlite3")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Values come back unchanged, including non-ASCII text, across instances."""
+        key = LLMCache.make_key("chat", "gpt-4o", [{"role": "user", "content": "Hola"}], None)
+        value = {"translations": [["Hola", "¡Buenas!"]], "count": 2}
+
+        cache = LLMCache(self.path, enabled=True)
+        self.assertIsNone(cache.get(key))
+        cache.set(key, value)
+        self.assertEqual(cache.get(key), value)
+
+        reopened = LLMCache(self.path, enabled=True)
+        self.assertEqual(reopened.get(key), value)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_make_key_is_stable(self):
+        """Equal parts give equal keys and any differing part changes the key."""
+        self.assertEqual(LLMCache.make_key("a", 1, {"x": [1]}), LLMCache.make_key("a", 1, {"x": [1]}))
+        self.assertNotEqual(LLMCache.make_key("a", 1), LLMCache.make_key("a", 2))
+
+    def test_lru_eviction(self):
+        """The least recently used entries are evicted beyond max_entries."""
+        cache = LLMCache(self.path, max_entries=2, enabled=True)
+        with mock.patch.object(llm_cache, "_EVICTION_CHECK_INTERVAL", 1), \
+                mock.patch.object(llm_cache.time, "time", side_effect=range(1000, 2000)):
+            cache.set("a", 1)
+            cache.set("b", 2)
+            self.assertEqual(cache.get("a"), 1)  # "b" is now the least recently used
+            cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_concurrent_hit_and_miss_counts(self):
+        """Hits and misses from concurrent lookups are all counted."""
+        cache = LLMCache(self.path, enabled=True)
+        cache.set("present", "value")
+        keys = ["present", "absent"] * 200
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(cache.get, keys))
+
+        self.assertEqual((cache.hits, cache.misses), (200, 200))
+
+    def test_shared_instance_created_once(self):
+        """Concurrent first calls to get_llm_cache share a single instance."""
+        def slow_cache():
+            time.sleep(0.01)
+            return object()
+
+        with mock.patch.object(llm_cache, "_llm_cache", None), \
+                mock.patch.object(llm_cache, "LLMCache", side_effect=slow_cache) as factory:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                caches = list(executor.map(lambda _: llm_cache.get_llm_cache(), range(8)))
+
+        self.assertEqual(factory.call_count, 1)
+        self.assertTrue(all(cache is caches[0] for cache in caches))
+
+    def test_disabled_by_environment(self):
+        """LLM_CACHE_DISABLE turns lookups and writes into no-ops without creating a database."""
+        try:
+            with mock.patch.dict(os.environ, {"LLM_CACHE_DISABLE": "1"}):
+                importlib.reload(llm_cache)
+                self.assertTrue(llm_cache.CACHE_DISABLED)
+                cache = llm_cache.LLMCache(self.path)
+                cache.set("key", "value")
+                self.assertIsNone(cache.get("key"))
+                self.assertFalse(os.path.exists(self.path))
+
+            with mock.patch.dict(os.environ, {"LLM_CACHE_DISABLE": "0"}):
+                importlib.reload(llm_cache)
+                self.assertFalse(llm_cache.CACHE_DISABLED)
+        finally:
+            importlib.reload(llm_cache)
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Test case for the similarity-based cache."""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "semantic.sqlite3")
+        self.vectors = np.eye(4, dtype=np.float32)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_lookup_by_similarity(self):
+        """A close enough embedding matches; namespaces and dissimilar embeddings do not."""
+        cache = SemanticCache(self.path, enabled=True)
+        cache.add("contexts", self.vectors[0], {"default_project_context": "Shop"})
+
+        similar = np.array([0.99, 0.1, 0, 0], dtype=np.float32)
+        similar /= np.linalg.norm(similar)
+        self.assertEqual(cache.lookup("contexts", similar, 0.9), {"default_project_context": "Shop"})
+        self.assertIsNone(cache.lookup("contexts", self.vectors[1], 0.9))
+        self.assertIsNone(cache.lookup("other", self.vectors[0], 0.9))
+
+    def test_lru_eviction(self):
+        """The least recently used entries are evicted beyond max_entries."""
+        cache = SemanticCache(self.path, max_entries=2, enabled=True)
+        with mock.patch.object(semantic_cache, "_EVICTION_CHECK_INTERVAL", 1), \
+                mock.patch.object(semantic_cache.time, "time", side_effect=range(1000, 2000)):
+            cache.add("n", self.vectors[0], "a")
+            cache.add("n", self.vectors[1], "b")
+            self.assertEqual(cache.lookup("n", self.vectors[0], 0.9), "a")
+            cache.add("n", self.vectors[2], "c")
+
+        self.assertEqual(cache.lookup("n", self.vectors[0], 0.9), "a")
+        self.assertIsNone(cache.lookup("n", self.vectors[1], 0.9))
+        self.assertEqual(cache.lookup("n", self.vectors[2], 0.9), "c")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,13 +20,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("test_main")
 
-def run_command(cmd: List[str], expect_failure: bool = False) -> bool:
+def run_command(cmd: List[str], expect_failure: bool = False, capture: bool = False) -> bool:
     """
     Run a shell command and return whether it succeeded.
     
     Args:
         cmd: Command and arguments to run
         expect_failure: Whether the command is expected to fail
+        capture: Whether to capture the command output for logging
+                 (discarded otherwise)
         
     Returns:
         True if the command succeeded (or failed as expected), False otherwise
@@ -34,12 +36,20 @@ def run_command(cmd: List[str], expect_failure: bool = False) -> bool:
     logger.info(f"Running command: {' '.join(cmd)}")
     
     try:
-        result = subprocess.run(cmd, check=not expect_failure, capture_output=True, text=True)
-        
-        # Log output if verbose
-        logger.debug(f"STDOUT: {result.stdout}")
-        if result.stderr:
-            logger.debug(f"STDERR: {result.stderr}")
+        if capture:
+            result = subprocess.run(cmd, check=not expect_failure, capture_output=True, text=True)
+            
+            # Log output if verbose
+            logger.debug(f"STDOUT: {result.stdout}")
+            if result.stderr:
+                logger.debug(f"STDERR: {result.stderr}")
+        else:
+            result = subprocess.run(
+                cmd,
+                check=not expect_failure,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
         
         if expect_failure:
             if result.returncode == 0:
@@ -54,8 +64,9 @@ def run_command(cmd: List[str], expect_failure: bool = False) -> bool:
     
     except subprocess.CalledProcessError as e:
         logger.error(f"Command failed with exit code {e.returncode}")
-        logger.error(f"STDOUT: {e.stdout}")
-        logger.error(f"STDERR: {e.stderr}")
+        if capture:
+            logger.error(f"STDOUT: {e.stdout}")
+            logger.error(f"STDERR: {e.stderr}")
         return False
 
 def test_help():
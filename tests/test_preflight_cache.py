@@ -0,0 +1,92 @@
+"""
+Unit tests for the cached pre-flight checks.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.validation import validation
+
+API_KEY = "sk-" + "a" * 48
+
+
+class TestPreflightCache(unittest.TestCase):
+    """Test case for run_preflight_checks result caching."""
+
+    def setUp(self):
+        """Create input and output directories and a clean environment."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.input_dir = os.path.join(temp_dir.name, "input")
+        self.output_dir = os.path.join(temp_dir.name, "output")
+        os.makedirs(self.input_dir)
+        with open(os.path.join(self.input_dir, "app.json"), 'w', encoding='utf-8') as f:
+            f.write('{"title": "Hello"}')
+
+        env = mock.patch.dict(os.environ, {"OPENAI_API_KEY": API_KEY})
+        env.start()
+        self.addCleanup(env.stop)
+        for name in ("PREFLIGHT_NO_CACHE", "VERIFY_API_KEY"):
+            os.environ.pop(name, None)
+
+        # Count how often the checks actually run by watching the input directory scan
+        scandir = mock.patch.object(validation.os, "scandir", wraps=os.scandir)
+        self.scandir = scandir.start()
+        self.addCleanup(scandir.stop)
+
+    def _run(self, **kwargs):
+        return validation.run_preflight_checks(self.input_dir, self.output_dir, **kwargs)
+
+    def test_second_run_is_cached(self):
+        """A passing run is remembered and the next run skips the checks."""
+        self.assertTrue(self._run())
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, validation.PREFLIGHT_CACHE_FILE)))
+        self.assertTrue(self._run())
+        self.assertEqual(self.scandir.call_count, 1)
+
+    def test_input_mtime_change_invalidates(self):
+        """Changing the input directory's mtime reruns the checks."""
+        self.assertTrue(self._run())
+        stat = os.stat(self.input_dir)
+        os.utime(self.input_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertTrue(self._run())
+        self.assertEqual(self.scandir.call_count, 2)
+
+    def test_api_key_change_invalidates(self):
+        """A different API key reruns the checks."""
+        self.assertTrue(self._run())
+        os.environ["OPENAI_API_KEY"] = "sk-" + "b" * 48
+        self.assertTrue(self._run())
+        self.assertEqual(self.scandir.call_count, 2)
+
+    def test_expired_cache_invalidates(self):
+        """Cached results older than PREFLIGHT_CACHE_TTL are ignored."""
+        self.assertTrue(self._run())
+        with mock.patch.object(validation.time, "time", return_value=validation.time.time() + validation.PREFLIGHT_CACHE_TTL + 1):
+            self.assertTrue(self._run())
+        self.assertEqual(self.scandir.call_count, 2)
+
+    def test_failed_run_is_not_cached(self):
+        """Failing checks are never remembered."""
+        os.environ["OPENAI_API_KEY"] = "not-a-key"
+        self.assertFalse(self._run())
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, validation.PREFLIGHT_CACHE_FILE)))
+
+    def test_opt_outs(self):
+        """Mock mode and PREFLIGHT_NO_CACHE always run the checks."""
+        self.assertTrue(self._run())
+        self.assertTrue(self._run(mock_mode=True))
+        os.environ["PREFLIGHT_NO_CACHE"] = "1"
+        self.assertTrue(self._run())
+        self.assertEqual(self.scandir.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for the token-bucket rate limiter.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.api import rate_limiter
+from utils.api.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test case for RateLimiter."""
+
+    def setUp(self):
+        """Replace the clock used by the limiter."""
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(
+            rate_limiter.time, monotonic=self.clock.monotonic, sleep=self.clock.sleep
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_up_to_requests_per_minute(self):
+        """A full bucket allows a burst, after which requests are spaced evenly."""
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(60):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+        limiter.acquire()
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[0], 1.0)
+
+    def test_tokens_per_minute(self):
+        """Requests wait until enough tokens have accrued."""
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600)
+        limiter.acquire(600)
+        limiter.acquire(300)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 30.0)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """A request larger than the token bucket is capped at one minute's worth."""
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=100)
+        limiter.acquire(100)
+        limiter.acquire(10000)
+        self.assertAlmostEqual(sum(self.clock.sleeps), 60.0)
+
+    def test_no_limits(self):
+        """Zero limits never block."""
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=0)
+        for _ in range(1000):
+            limiter.acquire(10000)
+        self.assertEqual(self.clock.sleeps, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Unit tests for the summary report.
+"""
+
+import sys
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.reporting.report_generator import generate_summary_report
+
+
+class TestSummaryReport(unittest.TestCase):
+    """Test case for generate_summary_report."""
+
+    def test_csv_keeps_names_intact(self):
+        """File names with commas, quotes or newlines survive the CSV report unchanged."""
+        files = ["menu,main.json", 'say "hi".json', "multi\nline.json"]
+        validation_results = {
+            filename: {"es": {"quality_score": 80 + i, "structure_score": 100}}
+            for i, filename in enumerate(files)
+        }
+
+        with tempfile.TemporaryDirectory() as log_dir:
+            report_path = generate_summary_report(validation_results, "in", "out", ["es"], files, {}, log_dir)
+            with open(Path(report_path).with_suffix(".csv"), 'r', newline='', encoding='utf-8') as csv_file:
+                rows = list(csv.reader(csv_file))
+
+        self.assertEqual(rows[:7], [
+            ["Category", "Item", "Quality Score", "Structure Score"],
+            ["Overall", "Average", "81.00", "100.00"],
+            [],
+            ["Languages", "", "", ""],
+            ["Language", "es", "81.00", "100.00"],
+            [],
+            ["Files", "", "", ""]
+        ])
+        self.assertEqual(rows[7:], [
+            ["File", filename, f"{80 + i:.2f}", "100.00"] for i, filename in enumerate(files)
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
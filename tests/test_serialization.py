@@ -0,0 +1,130 @@
+"""
+Unit tests for the JSON, compressed JSON Lines and MessagePack helpers.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.serialization import fast_json, msgpack_store, zstd_jsonl
+
+SAMPLE = {
+    "greeting": "¡Hola, mundo!",
+    "nested": {"items": [1, 2.5, True, None], "empty": {}},
+    "emoji": "🌍",
+    "quote": "He said \"hi\"\n"
+}
+
+
+class TestFastJson(unittest.TestCase):
+    """Test case for fast_json with and without orjson."""
+
+    def setUp(self):
+        """Create a temporary directory for JSON files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def _write(self, name, text):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def _check_equivalence(self):
+        """Output must match the standard json module for the same input."""
+        text = json.dumps(SAMPLE, ensure_ascii=False)
+        self.assertEqual(fast_json.loads(text), SAMPLE)
+        self.assertEqual(fast_json.loads(text.encode("utf-8")), SAMPLE)
+        self.assertEqual(fast_json.dumps(SAMPLE), json.dumps(SAMPLE, ensure_ascii=False, separators=(',', ':')))
+        self.assertEqual(json.loads(fast_json.dumps_pretty(SAMPLE)), SAMPLE)
+        self.assertIn("¡Hola", fast_json.dumps(SAMPLE))
+        with self.assertRaises(json.JSONDecodeError):
+            fast_json.loads("{not json")
+
+    def test_with_orjson(self):
+        """orjson, when installed, produces the same results as json."""
+        if fast_json.orjson is None:
+            self.skipTest("orjson is not installed")
+        self._check_equivalence()
+
+    def test_without_orjson(self):
+        """The standard json fallback produces the same results."""
+        with mock.patch.object(fast_json, "orjson", None):
+            self._check_equivalence()
+
+    def test_load_file_small_and_large(self):
+        """Files below and above MMAP_MIN_SIZE parse the same with either backend."""
+        small = self._write("small.json", json.dumps(SAMPLE, ensure_ascii=False))
+        large_data = {"strings": [SAMPLE["greeting"]] * 1000}
+        large = self._write("large.json", json.dumps(large_data, ensure_ascii=False))
+        self.assertLess(os.path.getsize(small), fast_json.MMAP_MIN_SIZE)
+        self.assertGreaterEqual(os.path.getsize(large), fast_json.MMAP_MIN_SIZE)
+
+        self.assertEqual(fast_json.load_file(small), SAMPLE)
+        self.assertEqual(fast_json.load_file(large), large_data)
+        with mock.patch.object(fast_json, "orjson", None):
+            self.assertEqual(fast_json.load_file(small), SAMPLE)
+            self.assertEqual(fast_json.load_file(large), large_data)
+
+    def test_load_file_uses_mmap_only_for_large_files(self):
+        """With orjson, only files of at least MMAP_MIN_SIZE bytes are memory-mapped."""
+        if fast_json.orjson is None:
+            self.skipTest("orjson is not installed")
+        small = self._write("small.json", "{}")
+        exact = self._write("exact.json", '{"a":"' + "x" * (fast_json.MMAP_MIN_SIZE - 8) + '"}')
+        self.assertEqual(os.path.getsize(exact), fast_json.MMAP_MIN_SIZE)
+
+        with mock.patch.object(fast_json.mmap, "mmap", wraps=fast_json.mmap.mmap) as mapped:
+            fast_json.load_file(small)
+            self.assertEqual(mapped.call_count, 0)
+            self.assertEqual(fast_json.load_file(exact), {"a": "x" * (fast_json.MMAP_MIN_SIZE - 8)})
+            self.assertEqual(mapped.call_count, 1)
+
+    def test_load_file_invalid(self):
+        """Invalid files raise json.JSONDecodeError from both paths."""
+        path = self._write("bad.json", "[" * fast_json.MMAP_MIN_SIZE)
+        with self.assertRaises(json.JSONDecodeError):
+            fast_json.load_file(path)
+
+
+@unittest.skipUnless(zstd_jsonl.AVAILABLE, "zstandard is not installed")
+class TestZstdJsonl(unittest.TestCase):
+    """Test case for compressed JSON Lines files."""
+
+    def test_round_trip(self):
+        """Records are read back in order after a flush and close."""
+        records = [{"path": f"key{i}", "refined": f"valor {i} ñ"} for i in range(100)]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "refined" + zstd_jsonl.EXTENSION)
+            with zstd_jsonl.JsonlZstWriter(path) as writer:
+                for record in records[:50]:
+                    writer.write(record)
+                writer.flush()
+                for record in records[50:]:
+                    writer.write(record)
+
+            self.assertEqual(list(zstd_jsonl.read_records(path)), records)
+
+
+@unittest.skipUnless(msgpack_store.AVAILABLE, "msgpack is not installed")
+class TestMsgpackStore(unittest.TestCase):
+    """Test case for MessagePack persistence."""
+
+    def test_round_trip(self):
+        """Options dictionaries survive a dump and load unchanged."""
+        options = {"menu.file": ["Archivo", "Fichero"], "menu.edit": ["Editar", "Edición"]}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "options.msgpack")
+            msgpack_store.dump(options, path)
+            self.assertEqual(msgpack_store.load(path), options)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for multi-language translation option generation.
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.translation import translation_generator
+from core.translation.translation_generator import (
+    _generate_multilang_batch_options,
+    _options_cache_key,
+    _request_multilang_batch_options
+)
+from utils.api.llm_cache import LLMCache
+
+MODEL = "test-model"
+OPTIONS_COUNT = 2
+LANGUAGES = ["es", "fr"]
+
+
+def _reply(entries):
+    """Build a multi-language options reply."""
+    return json.dumps({"translations": entries}, ensure_ascii=False)
+
+
+def _options(string, language):
+    """Build distinct options for a string in a language."""
+    return [f"{language}:{string}:{i}" for i in range(OPTIONS_COUNT)]
+
+
+class TestMultilangOptions(unittest.TestCase):
+    """Test case for _generate_multilang_batch_options and _request_multilang_batch_options."""
+
+    def setUp(self):
+        """Mock the API and the system prompt, and use a cache in a temporary directory."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = LLMCache(os.path.join(temp_dir.name, "llm_cache.sqlite3"), enabled=True)
+
+        self.call_openai = mock.Mock()
+        for name, value in (
+            ("call_openai", self.call_openai),
+            ("get_llm_cache", mock.Mock(return_value=self.cache)),
+            ("get_system_prompt", mock.Mock(return_value="Respond in JSON"))
+        ):
+            patcher = mock.patch.object(translation_generator, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _cached(self, string, language):
+        return self.cache.get(_options_cache_key(string, language, MODEL, OPTIONS_COUNT, None))
+
+    def _generate(self, strings, languages=LANGUAGES):
+        return _generate_multilang_batch_options(strings, languages, MODEL, OPTIONS_COUNT)
+
+    def _sent_strings(self):
+        """Source strings listed in the user message of the last request."""
+        return self.call_openai.call_args.kwargs["prompt"]["user"].split("\n")[2:]
+
+    def test_only_missing_strings_are_sent(self):
+        """Strings cached for every language are reused; the rest are requested and cached."""
+        for language in LANGUAGES:
+            self.cache.set(_options_cache_key("Apple", language, MODEL, OPTIONS_COUNT, None), _options("Apple", language))
+        self.call_openai.return_value = _reply([{language: _options("Banana", language) for language in LANGUAGES}])
+
+        results = self._generate(["Apple", "Banana"])
+
+        self.assertEqual(self._sent_strings(), ["Banana"])
+        for language in LANGUAGES:
+            self.assertEqual(results[language], [_options("Apple", language), _options("Banana", language)])
+            self.assertEqual(self._cached("Banana", language), _options("Banana", language))
+
+    def test_fully_cached_batch_makes_no_request(self):
+        """A batch cached for every language never calls the API."""
+        for language in LANGUAGES:
+            self.cache.set(_options_cache_key("Apple", language, MODEL, OPTIONS_COUNT, None), _options("Apple", language))
+
+        self.assertEqual(self._generate(["Apple"]), {language: [_options("Apple", language)] for language in LANGUAGES})
+        self.call_openai.assert_not_called()
+
+    def test_only_pending_languages_are_requested(self):
+        """Languages already cached for every string are left out of the request."""
+        self.cache.set(_options_cache_key("Apple", "es", MODEL, OPTIONS_COUNT, None), _options("Apple", "es"))
+        self.call_openai.return_value = _reply([{"fr": _options("Apple", "fr")}])
+
+        results = self._generate(["Apple"])
+
+        self.assertIn("(fr)", self.call_openai.call_args.kwargs["prompt"]["user"])
+        self.assertNotIn("(es)", self.call_openai.call_args.kwargs["prompt"]["user"])
+        self.assertEqual(results, {"es": [_options("Apple", "es")], "fr": [_options("Apple", "fr")]})
+
+    def test_missing_language_is_left_to_fallback(self):
+        """A language absent from the reply is dropped from the results and not cached."""
+        self.call_openai.return_value = _reply([{"es": _options("Apple", "es")}, {"es": _options("Banana", "es")}])
+
+        results = self._generate(["Apple", "Banana"])
+
+        self.assertEqual(list(results), ["es"])
+        self.assertEqual(results["es"], [_options("Apple", "es"), _options("Banana", "es")])
+        self.assertIsNone(self._cached("Apple", "fr"))
+
+    def test_entry_count_mismatch(self):
+        """A reply with the wrong number of entries is rejected as a whole."""
+        self.call_openai.return_value = _reply([{language: _options("Apple", language) for language in LANGUAGES}])
+
+        self.assertEqual(
+            _request_multilang_batch_options(["Apple", "Banana"], LANGUAGES, MODEL, OPTIONS_COUNT), {}
+        )
+        self.assertEqual(self._generate(["Apple", "Banana"]), {})
+        self.assertIsNone(self._cached("Apple", "es"))
+
+    def test_invalid_reply(self):
+        """API errors and malformed replies send every language to the fallback."""
+        self.call_openai.side_effect = Exception("timeout")
+        self.assertEqual(self._generate(["Apple"]), {})
+
+        self.call_openai.side_effect = None
+        for reply in ("not json", json.dumps({"translations": ["Apple"]})):
+            self.call_openai.return_value = reply
+            self.assertEqual(self._generate(["Apple"]), {})
+
+    def test_error_placeholders_are_not_cached(self):
+        """Options replaced by error placeholders are returned but never cached."""
+        self.call_openai.return_value = _reply([
+            {"es": "not a list", "fr": _options("Apple", "fr")},
+            {"es": _options("Banana", "es"), "fr": [None, None]}
+        ])
+
+        results = self._generate(["Apple", "Banana"])
+
+        self.assertTrue(all(option.startswith("Error:") for option in results["es"][0]))
+        self.assertEqual(results["fr"][1], [translation_generator._TRANSLATION_ERROR] * OPTIONS_COUNT)
+        self.assertIsNone(self._cached("Apple", "es"))
+        self.assertIsNone(self._cached("Banana", "fr"))
+        self.assertEqual(self._cached("Apple", "fr"), _options("Apple", "fr"))
+        self.assertEqual(self._cached("Banana", "es"), _options("Banana", "es"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,7 @@ import unittest
 from typing import Dict, List, Any
 import sys
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import modules
 sys.path.append(str(Path(__file__).parent.parent))
@@ -20,6 +21,21 @@ from translation_refiner import refine_translations
 from json_generator import generate_translated_jsons
 from translation_validator import validate_translations
 from context_generator import generate_context_configuration
+from utils.serialization import fast_json
+
+
+def _load_json_dir(path: str) -> Dict[str, Any]:
+    """Load every JSON file in a directory, reading the files in parallel."""
+    filenames = [f for f in os.listdir(path) if f.endswith(".json")]
+    if not filenames:
+        return {}
+
+    def _load(filename: str) -> Any:
+        with open(os.path.join(path, filename), 'rb') as f:
+            return fast_json.loads(f.read())
+
+    with ThreadPoolExecutor(max_workers=min(32, len(filenames))) as executor:
+        return dict(zip(filenames, executor.map(_load, filenames)))
 
 
 class TestTranslationPipeline(unittest.TestCase):
@@ -88,11 +104,7 @@ class TestTranslationPipeline(unittest.TestCase):
     def test_extract_strings(self):
         """Test string extraction from JSON files."""
         # Load sample JSON file
-        json_files = {}
-        for filename in os.listdir(self.input_dir):
-            if filename.endswith(".json"):
-                with open(os.path.join(self.input_dir, filename), 'r', encoding='utf-8') as f:
-                    json_files[filename] = json.load(f)
+        json_files = _load_json_dir(self.input_dir)
         
         # Extract strings
         extracted = extract_strings(json_files, self.dirs["extracted"])
@@ -108,15 +120,15 @@ class TestTranslationPipeline(unittest.TestCase):
         self.assertIn("messages.welcome", extracted["test.json"])
         self.assertIn("messages.goodbye", extracted["test.json"])
         
-        return extracted
+        return extracted, json_files
 
     def test_pipeline_integration(self):
         """Test the full pipeline integration."""
         # This is an integration test that checks if the pipeline components work together
         # We'll just call each stage and verify it doesn't raise exceptions
         try:
-            # Get extracted strings
-            extracted = self.test_extract_strings()
+            # Get extracted strings and the JSON files they came from
+            extracted, json_files = self.test_extract_strings()
             
             # Generate options
             options = generate_translation_options(
@@ -128,13 +140,6 @@ class TestTranslationPipeline(unittest.TestCase):
                 self.project_context
             )
             
-            # Load JSON files for context
-            json_files = {}
-            for filename in os.listdir(self.input_dir):
-                if filename.endswith(".json"):
-                    with open(os.path.join(self.input_dir, filename), 'r', encoding='utf-8') as f:
-                        json_files[filename] = json.load(f)
-            
             # Select best translations
             selected = select_best_translations(
                 options, 
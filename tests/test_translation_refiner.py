@@ -0,0 +1,132 @@
+"""
+Unit tests for refining and saving translations per file and language.
+"""
+
+import os
+import sys
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.translation import translation_refiner
+from core.translation.translation_refiner import (
+    _batch_custom_id,
+    _refine_file_language,
+    refine_translations
+)
+
+MODEL = "test-model"
+CSV_HEADER = ["Path", "Original", "Refined Translation"]
+
+
+def _sent_batch(prompt):
+    """Decode the batch items serialized at the end of a refinement prompt."""
+    return json.loads(prompt["user"].split("\n", 2)[2])
+
+
+def _refine_all(prompt, model=None):
+    """Reply with a refined version of every translation in the prompt."""
+    return json.dumps({"refined_translations": [f"{item['translation']}!" for item in _sent_batch(prompt)]})
+
+
+class TestRefineFileLanguage(unittest.TestCase):
+    """Test case for the refined translations write path."""
+
+    def setUp(self):
+        """Mock the API and the system prompt, and create an output directory."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_dir = temp_dir.name
+
+        self.call_openai = mock.Mock(side_effect=_refine_all)
+        self.cache_openai_response = mock.Mock()
+        for name, value in (
+            ("call_openai", self.call_openai),
+            ("cache_openai_response", self.cache_openai_response),
+            ("get_system_prompt", mock.Mock(return_value="Respond in JSON"))
+        ):
+            patcher = mock.patch.object(translation_refiner, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _read_csv(self, path):
+        with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+            return list(csv.reader(csvfile))
+
+    def _leftover_partials(self):
+        return [name for name in os.listdir(self.output_dir) if name.endswith(".partial")]
+
+    def test_unchanged_rows_are_written_first(self):
+        """Empty and non-string values skip the model and precede the refined rows."""
+        selected = {"app": {"es": {"title": "Hola", "blank": "", "count": None, "body": "Texto"}}}
+        originals = {"app": {"title": "Hello", "blank": "", "count": "Count", "body": "Text"}}
+
+        refined = refine_translations(selected, originals, ["es"], MODEL, self.output_dir, batch_size=10)
+
+        self.assertEqual(refined, {"app": {"es": {"blank": "", "count": None, "title": "Hola!", "body": "Texto!"}}})
+        self.assertEqual(self._read_csv(os.path.join(self.output_dir, "app_es_refined.csv")), [
+            CSV_HEADER,
+            ["blank", "", ""],
+            ["count", "Count", ""],
+            ["title", "Hello", "Hola!"],
+            ["body", "Text", "Texto!"]
+        ])
+        self.assertEqual(self._leftover_partials(), [])
+        self.assertEqual([item["path"] for item in _sent_batch(self.call_openai.call_args.kwargs["prompt"])],
+                         ["title", "body"])
+        self.cache_openai_response.assert_called_once()
+
+    def test_wrong_item_count_falls_back(self):
+        """A reply with the wrong number of items keeps the original translations and is not cached."""
+        self.call_openai.side_effect = None
+        self.call_openai.return_value = json.dumps({"refined_translations": ["only one"]})
+        batches = [[
+            {"path": "title", "original": "Hello", "translation": "Hola"},
+            {"path": "body", "original": "Text", "translation": "Texto"}
+        ]]
+        output_path = os.path.join(self.output_dir, "app_es_refined.csv")
+
+        refined = _refine_file_language(
+            "app", "es", output_path, batches, {}, {"title": "Hello", "body": "Text"}, MODEL, None, {}
+        )
+
+        self.assertEqual(refined, {"title": "Hola", "body": "Texto"})
+        self.assertEqual(self._read_csv(output_path), [
+            CSV_HEADER, ["title", "Hello", "Hola"], ["body", "Text", "Texto"]
+        ])
+        self.assertEqual(self._leftover_partials(), [])
+        self.cache_openai_response.assert_not_called()
+
+    def test_batch_api_results_matched_by_custom_id(self):
+        """Batch API replies are used for their own batch; other batches are refined directly."""
+        batches = [
+            [{"path": "a", "original": "A", "translation": "a"}],
+            [{"path": "b", "original": "B", "translation": "b"}],
+            [{"path": "c", "original": "C", "translation": "c"}]
+        ]
+        batch_api_results = {
+            _batch_custom_id("app", "es", 0): json.dumps({"refined_translations": ["from batch"]}),
+            _batch_custom_id("app", "es", 2): json.dumps({"refined_translations": ["x", "y"]}),
+            _batch_custom_id("other", "es", 1): json.dumps({"refined_translations": ["wrong file"]})
+        }
+        output_path = os.path.join(self.output_dir, "app_es_refined.csv")
+
+        refined = _refine_file_language(
+            "app", "es", output_path, batches, {}, {"a": "A", "b": "B", "c": "C"}, MODEL, None, batch_api_results
+        )
+
+        self.assertEqual(refined, {"a": "from batch", "b": "b!", "c": "c"})
+        self.assertEqual(self.call_openai.call_count, 1)
+        self.assertEqual(_sent_batch(self.call_openai.call_args.kwargs["prompt"])[0]["path"], "b")
+        self.assertEqual([row[2] for row in self._read_csv(output_path)[1:]], ["from batch", "b!", "c"])
+        self.assertEqual(self._leftover_partials(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
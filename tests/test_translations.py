@@ -79,8 +79,9 @@ def test_translation_pipeline():
     
     # Step 4: Verify translated files exist
     logger.info("Step 4: Verifying translated files...")
+    language_codes = load_language_codes()
     for language in languages:
-        language_code = load_language_codes().get(language, language.lower())
+        language_code = language_codes.get(language, language.lower())
         lang_dir = os.path.join(output_dir, language_code)
         
         if not os.path.isdir(lang_dir):
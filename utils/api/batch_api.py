@@ -0,0 +1,128 @@
+"""
+Helpers for OpenAI's Batch API.
+Batch jobs run asynchronously within a 24 hour window at a lower token price,
+which suits pipeline steps that only need their results once everything is done.
+"""
+
+import json
+import time
+import logging
+from typing import Dict, List, Any, Optional
+
+from utils.api.util_call import get_llm_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Batch statuses after which the job will not change any more
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_request(custom_id: str, prompt: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """
+    Build one Batch API request line from a structured prompt.
+
+    Args:
+        custom_id: Identifier used to match the result to the request
+        prompt: Dictionary with 'system', 'user', and optionally 'response_format'
+        model: Model to use for the request
+
+    Returns:
+        Request dictionary for the batch input file
+    """
+    messages = []
+    if prompt.get("system"):
+        messages.append({"role": "system", "content": prompt["system"]})
+    if prompt.get("user"):
+        messages.append({"role": "user", "content": prompt["user"]})
+
+    body = {"model": model, "messages": messages}
+    if prompt.get("response_format"):
+        body["response_format"] = prompt["response_format"]
+
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body
+    }
+
+
+def submit_batch(requests: List[Dict[str, Any]]) -> str:
+    """
+    Upload requests as a JSONL file and start a batch job for them.
+
+    Args:
+        requests: Request dictionaries from build_request
+
+    Returns:
+        ID of the created batch job
+    """
+    client = get_llm_client().client
+
+    jsonl = "\n".join(json.dumps(request, ensure_ascii=False) for request in requests)
+    input_file = client.files.create(
+        file=("batch_requests.jsonl", jsonl.encode("utf-8")),
+        purpose="batch"
+    )
+
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, poll_interval: float = 30) -> Any:
+    """
+    Poll a batch job until it reaches a terminal status.
+
+    Args:
+        batch_id: ID of the batch job
+        poll_interval: Seconds to wait between status checks
+
+    Returns:
+        The final batch object
+    """
+    client = get_llm_client().client
+
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_STATUSES:
+            logger.info(f"Batch {batch_id} finished with status {batch.status}")
+            return batch
+
+        logger.debug(f"Batch {batch_id} is {batch.status}; checking again in {poll_interval}s")
+        time.sleep(poll_interval)
+
+
+def parse_results(batch: Any) -> Dict[str, str]:
+    """
+    Download the output of a completed batch job.
+
+    Args:
+        batch: Completed batch object from wait_for_batch
+
+    Returns:
+        Dictionary mapping custom IDs to response texts; requests that failed are left out
+    """
+    if not batch.output_file_id:
+        return {}
+
+    client = get_llm_client().client
+    output = client.files.content(batch.output_file_id).text
+
+    results = {}
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.warning(f"Batch request {entry.get('custom_id')} failed: {entry.get('error')}")
+            continue
+        results[entry["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+
+    return results
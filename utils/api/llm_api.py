@@ -3,15 +3,44 @@ Wrapper module for LLM API calls with rate limiting and retry functionality.
 Supports OpenAI's Chat Completions API.
 """
 
+import json
 import time
 import logging
-from openai import OpenAI
+import threading
+from openai import OpenAI, APIStatusError
 from typing import List, Dict, Any, Optional, Union
 from utils.config.config import API_CONFIG
+from utils.api.llm_cache import LLMCache, get_llm_cache
+from utils.api.rate_limiter import RateLimiter
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Connection-pooled OpenAI clients shared by all LLMApi instances, keyed by API key
+_openai_clients: Dict[str, OpenAI] = {}
+_openai_clients_lock = threading.Lock()
+
+# Plain JSON mode, used when a model rejects strict json_schema response formats
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get or create the shared OpenAI client for an API key.
+    The client's connection pool keeps HTTPS connections alive, so reusing it across
+    calls and models avoids a new TLS handshake per client.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared OpenAI client
+    """
+    with _openai_clients_lock:
+        if api_key not in _openai_clients:
+            _openai_clients[api_key] = OpenAI(api_key=api_key)
+        return _openai_clients[api_key]
+
 
 class LLMApi:
     """Wrapper for OpenAI API with rate limiting and retry logic"""
@@ -30,7 +59,8 @@ class LLMApi:
         Args:
             api_key: OpenAI API key (optional, defaults to config)
             model: Model to use for completions (optional, defaults to config)
-            min_delay: Minimum delay between API calls (optional, defaults to config)
+            min_delay: Average delay between API calls when no requests-per-minute limit
+                       is configured (optional, defaults to config)
             max_retries: Maximum number of retry attempts (optional, defaults to config)
             retry_delay: Base delay between retries (optional, defaults to config)
         """
@@ -42,7 +72,7 @@ class LLMApi:
         if not self.api_key:
             logger.warning("No API key provided! Set OPENAI_API_KEY in your .env file or pass it explicitly.")
             
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_openai_client(self.api_key)
         self.model = model or defaults.get("options_model", "o1")
         self.min_delay = min_delay or defaults.get("min_delay", 0.5)
         self.max_retries = max_retries or defaults.get("max_retries", 3)
@@ -51,6 +81,16 @@ class LLMApi:
         self.last_call_time = 0
         self.call_count = 0
         self.last_response = ""
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.error_counts = {}
+        self.json_schema_supported = True
+        self._stats_lock = threading.Lock()
+
+        # Token buckets for requests and tokens per minute; without an explicit request
+        # limit, allow one request per min_delay on average
+        requests_per_minute = defaults.get("requests_per_minute") or 60 / self.min_delay
+        self.rate_limiter = RateLimiter(requests_per_minute, defaults.get("tokens_per_minute", 0))
 
     def call_model(self, prompt: str, timeout: Optional[float] = None) -> str:
         """
@@ -108,18 +148,54 @@ class LLMApi:
         Returns:
             Model's response text
 
+        Raises:
+            Exception: If all retry attempts fail
+        """
+        # Identical requests are answered from the persistent cache; no temperature is
+        # ever set, so requests are treated as deterministic. Replies are only stored
+        # through cache_response, once the caller has validated them
+        cached = get_llm_cache().get(self._cache_key(messages, response_format))
+        if cached is not None:
+            with self._stats_lock:
+                self.cache_hits += 1
+                self.last_response = cached
+            return cached
+        with self._stats_lock:
+            self.cache_misses += 1
+
+        # Once the model has rejected a json_schema format, go straight to JSON mode
+        if not self.json_schema_supported and _is_json_schema(response_format):
+            response_format = JSON_OBJECT_FORMAT
+        return self._request_with_retries(messages, response_format, timeout)
+
+    def _request_with_retries(
+            self,
+            messages: List[Dict[str, str]],
+            response_format: Optional[Dict[str, str]],
+            timeout: Optional[float]
+    ) -> str:
+        """
+        Send a chat request, retrying transient failures with exponential backoff.
+        A strict json_schema format rejected by the model is retried once as JSON mode.
+
+        Args:
+            messages: List of message objects with role and content
+            response_format: Response format sent with the request (or None)
+            timeout: Request timeout in seconds (None uses default)
+
+        Returns:
+            Model's response text
+
         Raises:
             Exception: If all retry attempts fail
         """
         for attempt in range(self.max_retries):
             try:
                 # Rate limiting
-                current_time = time.time()
-                if current_time - self.last_call_time < self.min_delay:
-                    time.sleep(self.min_delay - (current_time - self.last_call_time))
-
-                self.last_call_time = time.time()
-                self.call_count += 1
+                self.rate_limiter.acquire(_estimate_tokens(messages))
+                with self._stats_lock:
+                    self.last_call_time = time.time()
+                    self.call_count += 1
 
                 # Build the API request arguments
                 api_args = {
@@ -139,10 +215,31 @@ class LLMApi:
                 logger.debug(f"Making API call with model {self.model}")
                 response = self.client.chat.completions.create(**api_args)
 
-                self.last_response = response.choices[0].message.content.strip()
-                return self.last_response
+                # Several threads share this client, so return the local copy
+                response_text = response.choices[0].message.content.strip()
+                with self._stats_lock:
+                    self.last_response = response_text
+                return response_text
 
             except Exception as e:
+                with self._stats_lock:
+                    error_name = type(e).__name__
+                    self.error_counts[error_name] = self.error_counts.get(error_name, 0) + 1
+
+                # Models without structured outputs reject json_schema requests with a 400 naming
+                # the response format; other 400s come from the prompt and are not retried
+                if _is_json_schema(response_format) and _is_response_format_rejection(e):
+                    logger.warning(f"Model {self.model} rejected the json_schema response format, "
+                                   f"falling back to JSON mode: {str(e)}")
+                    self.json_schema_supported = False
+                    return self._request_with_retries(messages, JSON_OBJECT_FORMAT, timeout)
+
+                # Client errors such as bad requests or invalid keys fail the same way every time
+                if not _is_retryable(e):
+                    error_msg = f"API call failed with non-retryable error: {str(e)}"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
+
                 # Use exponential backoff for retry delay
                 backoff_delay = self.retry_delay * (2 ** attempt)
                 
@@ -167,10 +264,81 @@ class LLMApi:
                     logger.error(error_msg)
                     raise Exception(error_msg)
 
+    def cache_response(
+            self,
+            messages: List[Dict[str, str]],
+            response_format: Optional[Dict[str, str]],
+            response_text: str
+    ) -> None:
+        """
+        Store an accepted reply so identical requests are answered from the cache.
+
+        Args:
+            messages: Messages of the request
+            response_format: Response format of the request (or None)
+            response_text: Reply the caller validated
+        """
+        get_llm_cache().set(self._cache_key(messages, response_format), response_text)
+
+    def _cache_key(self, messages: List[Dict[str, str]], response_format: Optional[Dict[str, str]]) -> str:
+        """Build the LLM cache key of a chat request for this client's model."""
+        return LLMCache.make_key("chat", self.model, messages, response_format)
+
     def get_usage_stats(self) -> dict:
         """Return current usage statistics"""
-        return {
-            "total_calls": self.call_count,
-            "last_call_time": self.last_call_time,
-            "last_response_length": len(self.last_response)
-        } 
\ No newline at end of file
+        with self._stats_lock:
+            return {
+                "total_calls": self.call_count,
+                "last_call_time": self.last_call_time,
+                "last_response_length": len(self.last_response),
+                "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+                "errors": dict(self.error_counts)
+            }
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Check whether a failed API call may succeed if retried.
+
+    Args:
+        error: Exception raised by the API call
+
+    Returns:
+        False for HTTP 4xx errors other than timeouts, conflicts and rate limits; True otherwise
+    """
+    if isinstance(error, APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return True
+
+
+def _is_json_schema(response_format: Optional[Dict[str, Any]]) -> bool:
+    """Check whether a response format requests strict structured output."""
+    return bool(response_format) and response_format.get("type") == "json_schema"
+
+
+def _is_response_format_rejection(error: Exception) -> bool:
+    """
+    Check whether a failed API call was rejected because of its response format.
+
+    Args:
+        error: Exception raised by the API call
+
+    Returns:
+        True for HTTP 400 errors whose param or code names response_format, or
+        whose message mentions json_schema
+    """
+    if not isinstance(error, APIStatusError) or error.status_code != 400:
+        return False
+
+    # The SDK passes the error object, but some responses keep it under "error"
+    body = error.body if isinstance(error.body, dict) else {}
+    details = body.get("error") if isinstance(body.get("error"), dict) else body
+    fields = [details.get("param"), details.get("code"), getattr(error, "param", None), getattr(error, "code", None)]
+    if any("response_format" in str(field) for field in fields if field):
+        return True
+    return "json_schema" in str(details.get("message") or error.message)
+
+
+def _estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    """Roughly estimate the prompt token count of a request (about four characters per token)."""
+    return len(json.dumps(messages, ensure_ascii=False)) // 4 + 1
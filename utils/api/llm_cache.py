@@ -0,0 +1,182 @@
+"""
+Persistent cache for LLM results.
+Stores JSON-serializable values in a local SQLite database under SHA-256 keys,
+so repeated pipeline runs can reuse earlier answers instead of paying for new API calls.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Optional
+
+from utils.filesystem.directories import ensure_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default location of the cache database
+DEFAULT_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join("cache", "llm_cache.sqlite3"))
+
+# Maximum number of cached entries; the least recently used entries are evicted beyond it
+DEFAULT_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+# Set LLM_CACHE_DISABLE to a non-empty value other than "0" to bypass the cache entirely
+CACHE_DISABLED = os.environ.get("LLM_CACHE_DISABLE", "") not in ("", "0")
+
+# Number of writes between checks of the entry count
+_EVICTION_CHECK_INTERVAL = 100
+
+
+class LLMCache:
+    """SQLite-backed key-value store for LLM results."""
+
+    def __init__(
+            self,
+            path: str = DEFAULT_CACHE_PATH,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            enabled: bool = not CACHE_DISABLED
+    ):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of entries kept before evicting the least recently used
+            enabled: Whether lookups and writes use the database at all
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._writes_since_eviction_check = 0
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from JSON-serializable parts.
+
+        Args:
+            *parts: Values that together identify a cached result
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON encoding of the parts
+        """
+        canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached value, or None if the key is not cached
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    # Mark the entry as recently used
+                    conn.execute("UPDATE cache SET ts = ? WHERE key = ?", (int(time.time()), key))
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache lookup failed: {e}")
+                row = None
+
+            # Count under the lock; lookups run concurrently from worker threads
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache, replacing any previous value for the key.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable value to store
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), int(time.time()))
+                )
+
+                self._writes_since_eviction_check += 1
+                if self._writes_since_eviction_check >= _EVICTION_CHECK_INTERVAL:
+                    self._writes_since_eviction_check = 0
+                    self._evict(conn)
+
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete the least recently used entries beyond max_entries."""
+        count = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY ts LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the cache table on first use."""
+        if self._conn is None:
+            ensure_dir(os.path.dirname(self.path))
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_ts ON cache (ts)")
+            self._conn = conn
+        return self._conn
+
+
+# Shared cache instance (lazy initialization); the lock keeps concurrent first
+# calls from worker threads from creating several instances
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Get or initialize the shared LLM result cache.
+
+    Returns:
+        Shared LLMCache instance
+    """
+    global _llm_cache
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+
+        return _llm_cache
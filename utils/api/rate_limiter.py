@@ -0,0 +1,75 @@
+"""
+Token-bucket rate limiter for LLM API calls.
+Tracks requests per minute and tokens per minute so concurrent callers can use
+the available headroom without tripping the provider's rate limits.
+"""
+
+import time
+import threading
+
+
+class RateLimiter:
+    """Thread-safe limiter with separate request and token buckets."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            requests_per_minute: Maximum requests per minute (0 for no limit)
+            tokens_per_minute: Maximum estimated tokens per minute (0 for no limit)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until both buckets have capacity for one request, then take it.
+
+        Args:
+            tokens: Estimated number of tokens the request will use
+        """
+        # A request larger than the whole bucket only has to wait for a full bucket
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill()
+
+                wait = 0.0
+                if self.requests_per_minute and self._available_requests < 1:
+                    wait = (1 - self._available_requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self._available_tokens < tokens:
+                    wait = max(wait, (tokens - self._available_tokens) * 60 / self.tokens_per_minute)
+
+                if wait == 0.0:
+                    if self.requests_per_minute:
+                        self._available_requests -= 1
+                    if self.tokens_per_minute:
+                        self._available_tokens -= tokens
+                    return
+
+            time.sleep(wait)
+
+    def _refill(self) -> None:
+        """Add the capacity accrued since the last update, up to one minute's worth."""
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+
+        if self.requests_per_minute:
+            self._available_requests = min(
+                float(self.requests_per_minute),
+                self._available_requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._available_tokens = min(
+                float(self.tokens_per_minute),
+                self._available_tokens + elapsed * self.tokens_per_minute / 60
+            )
@@ -0,0 +1,198 @@
+"""
+Similarity-based cache for LLM results.
+Stores unit-normalized text embeddings next to results in the LLM cache database,
+so paraphrased inputs can reuse a result generated for an earlier, similar input.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+from utils.api.llm_cache import DEFAULT_CACHE_PATH, DEFAULT_MAX_ENTRIES, CACHE_DISABLED, LLMCache, get_llm_cache
+from utils.api.util_call import get_llm_client
+from utils.filesystem.directories import ensure_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Default embedding model
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Number of writes between checks of the entry count
+_EVICTION_CHECK_INTERVAL = 100
+
+
+class SemanticCache:
+    """SQLite-backed store of (embedding, value) rows searched by cosine similarity."""
+
+    def __init__(
+            self,
+            path: str = DEFAULT_CACHE_PATH,
+            max_entries: int = DEFAULT_MAX_ENTRIES,
+            enabled: bool = not CACHE_DISABLED
+    ):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of entries kept before evicting the least recently used
+            enabled: Whether lookups and writes use the database at all
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._writes_since_eviction_check = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def lookup(self, namespace: str, embedding: np.ndarray, threshold: float) -> Optional[Any]:
+        """
+        Find the stored value whose embedding is most similar to the given one.
+
+        Args:
+            namespace: Kind of result to search (e.g. task name and model)
+            embedding: Unit-normalized query embedding
+            threshold: Minimum cosine similarity for a match
+
+        Returns:
+            The best matching value, or None if nothing reaches the threshold
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT embedding, value, id FROM semantic_cache WHERE namespace = ?", (namespace,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+        # Compare against every stored embedding in one matrix-vector product
+        rows = [row for row in rows if len(row[0]) == embedding.nbytes]
+        if not rows:
+            return None
+        matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        similarities = matrix @ embedding
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None
+
+        # Mark the entry as recently used
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("UPDATE semantic_cache SET ts = ? WHERE id = ?", (int(time.time()), rows[best][2]))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Semantic cache update failed: {e}")
+
+        logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+        return json.loads(rows[best][1])
+
+    def add(self, namespace: str, embedding: np.ndarray, value: Any) -> None:
+        """
+        Store a value under an embedding.
+
+        Args:
+            namespace: Kind of result being stored
+            embedding: Unit-normalized embedding of the input
+            value: JSON-serializable value to store
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT INTO semantic_cache (namespace, embedding, value, ts) VALUES (?, ?, ?, ?)",
+                    (namespace, embedding.astype(np.float32).tobytes(),
+                     json.dumps(value, ensure_ascii=False), int(time.time()))
+                )
+
+                self._writes_since_eviction_check += 1
+                if self._writes_since_eviction_check >= _EVICTION_CHECK_INTERVAL:
+                    self._writes_since_eviction_check = 0
+                    self._evict(conn)
+
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Semantic cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete the least recently used entries beyond max_entries."""
+        count = conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM semantic_cache WHERE id IN (SELECT id FROM semantic_cache ORDER BY ts, id LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the semantic cache table on first use."""
+        if self._conn is None:
+            ensure_dir(os.path.dirname(self.path))
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache "
+                "(id INTEGER PRIMARY KEY, namespace TEXT NOT NULL, embedding BLOB NOT NULL, "
+                "value TEXT NOT NULL, ts INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS semantic_cache_namespace ON semantic_cache (namespace)")
+            self._conn = conn
+        return self._conn
+
+
+def embed_text(text: str, model: str = DEFAULT_EMBEDDING_MODEL) -> np.ndarray:
+    """
+    Get the unit-normalized embedding of a text, reusing cached embeddings.
+
+    Args:
+        text: Text to embed
+        model: Embedding model to use
+
+    Returns:
+        float32 embedding vector with unit length
+    """
+    cache = get_llm_cache()
+    key = LLMCache.make_key("embedding", model, text)
+    vector = cache.get(key)
+    if vector is None:
+        response = get_llm_client().client.embeddings.create(model=model, input=text)
+        vector = response.data[0].embedding
+        cache.set(key, vector)
+
+    embedding = np.asarray(vector, dtype=np.float32)
+    return embedding / np.linalg.norm(embedding)
+
+
+# Shared cache instance (lazy initialization)
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Get or initialize the shared semantic cache.
+
+    Returns:
+        Shared SemanticCache instance
+    """
+    global _semantic_cache
+
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache()
+
+        return _semantic_cache
@@ -5,16 +5,19 @@ Provides a simplified interface for interacting with LLM APIs.
 
 import os
 import logging
-from typing import Dict, Any, Optional, List, Union
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Union
 from utils.api.llm_api import LLMApi
 from utils.config.config import API_CONFIG
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize clients (lazy initialization)
+# Initialize clients (lazy initialization); one client is kept per model so that
+# switching models between pipeline steps does not rebuild clients
 _llm_client = None
+_llm_clients: Dict[str, LLMApi] = {}
+_llm_clients_lock = threading.Lock()
 
 
 def get_llm_client(
@@ -29,7 +32,7 @@ def get_llm_client(
     Args:
         model: OpenAI model to use (optional, defaults to config)
         api_key: API key to use (optional, defaults to config)
-        min_delay: Minimum delay between calls (optional, defaults to config)
+        min_delay: Average delay between calls when no requests-per-minute limit is set (optional, defaults to config)
         max_retries: Maximum number of retries (optional, defaults to config)
 
     Returns:
@@ -37,18 +40,22 @@ def get_llm_client(
     """
     global _llm_client
     
-    # Get defaults from config
-    openai_config = API_CONFIG.get("openai", {})
-    
-    # If no client exists or model has changed, create a new one
-    if _llm_client is None or (model and _llm_client.model != model):
-        _llm_client = LLMApi(
-            api_key=api_key,
-            model=model,
-            min_delay=min_delay,
-            max_retries=max_retries
-        )
-    
+    with _llm_clients_lock:
+        # Without a model, keep using the current client
+        if _llm_client is not None and not model:
+            return _llm_client
+
+        # Reuse the client for this model, creating it on first use
+        model = model or API_CONFIG.get("openai", {}).get("defaults", {}).get("options_model", "o1")
+        if model not in _llm_clients:
+            _llm_clients[model] = LLMApi(
+                api_key=api_key,
+                model=model,
+                min_delay=min_delay,
+                max_retries=max_retries
+            )
+        _llm_client = _llm_clients[model]
+
     return _llm_client
 
 
@@ -59,6 +66,8 @@ def call_openai(
 ) -> str:
     """
     Call OpenAI API with the given prompt, handling different prompt formats.
+    Replies are looked up in the LLM cache but never stored there; once the caller
+    has checked that a reply is usable it can store it with cache_openai_response.
 
     Args:
         prompt: Either a string prompt or a dictionary with structured prompt information
@@ -76,39 +85,74 @@ def call_openai(
     client = get_llm_client(model=model)
 
     try:
-        # Handle different prompt formats
-        if isinstance(prompt, dict):
-            # Extract components from the structured prompt
-            system_content = prompt.get('system', '')
-            user_content = prompt.get('user', '')
-            response_format_str = prompt.get('response_format', None)
-
-            # Create message list
-            messages = []
-            if system_content:
-                messages.append({"role": "system", "content": system_content})
-            if user_content:
-                messages.append({"role": "user", "content": user_content})
-
-            # Process response_format - convert string to proper object format if needed
-            response_format = None
-            if response_format_str:
-                if isinstance(response_format_str, str) and response_format_str.lower() == 'json':
-                    response_format = {"type": "json_object"}
-                elif isinstance(response_format_str, dict):
-                    response_format = response_format_str
-                else:
-                    logger.warning(f"Ignoring invalid response_format: {response_format_str}")
-
-            # Call LLMApi with structured format
-            return client.call_structured_model(
-                messages=messages,
-                response_format=response_format,
-                timeout=timeout
-            )
-        else:
-            # Handle simple string prompt
-            return client.call_model(prompt)
+        messages, response_format = _build_request(prompt)
+        return client.call_structured_model(
+            messages=messages,
+            response_format=response_format,
+            timeout=timeout
+        )
     except Exception as e:
         logger.error(f"Error calling OpenAI ({model}): {e}")
-        raise 
\ No newline at end of file
+        raise
+
+
+def cache_openai_response(
+        prompt: Union[str, Dict[str, Any]],
+        response_text: str,
+        model: Optional[str] = None
+) -> None:
+    """
+    Store a reply from call_openai in the LLM cache after the caller has accepted it,
+    so identical requests in later runs are answered without an API call.
+
+    Args:
+        prompt: The prompt passed to call_openai
+        response_text: The reply that was accepted
+        model: The model passed to call_openai (optional, defaults to config)
+    """
+    if model is None:
+        model = API_CONFIG.get("openai", {}).get("defaults", {}).get("options_model", "o1")
+
+    messages, response_format = _build_request(prompt)
+    get_llm_client(model=model).cache_response(messages, response_format, response_text)
+
+
+def _build_request(
+        prompt: Union[str, Dict[str, Any]]
+) -> Tuple[List[Dict[str, str]], Optional[Dict[str, Any]]]:
+    """
+    Turn a string or structured prompt into chat messages and a response format.
+
+    Args:
+        prompt: String prompt, or dictionary with 'system', 'user', and optionally 'response_format'
+
+    Returns:
+        Tuple of (messages, response_format or None)
+    """
+    # Handle simple string prompt
+    if not isinstance(prompt, dict):
+        return [{"role": "user", "content": prompt}], None
+
+    # Extract components from the structured prompt
+    system_content = prompt.get('system', '')
+    user_content = prompt.get('user', '')
+    response_format_str = prompt.get('response_format', None)
+
+    # Create message list
+    messages = []
+    if system_content:
+        messages.append({"role": "system", "content": system_content})
+    if user_content:
+        messages.append({"role": "user", "content": user_content})
+
+    # Process response_format - convert string to proper object format if needed
+    response_format = None
+    if response_format_str:
+        if isinstance(response_format_str, str) and response_format_str.lower() == 'json':
+            response_format = {"type": "json_object"}
+        elif isinstance(response_format_str, dict):
+            response_format = response_format_str
+        else:
+            logger.warning(f"Ignoring invalid response_format: {response_format_str}")
+
+    return messages, response_format
@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass, field
 
+from utils.filesystem.directories import ensure_dir
+
 # Load environment variables from .env file if it exists
 try:
     from dotenv import load_dotenv
@@ -33,6 +35,9 @@ API_CONFIG = {
             "validation_model": os.environ.get("VALIDATION_MODEL", "gpt-4o"),
             "context_generator_model": os.environ.get("CONTEXT_MODEL", "gpt-4o"),
             "min_delay": float(os.environ.get("MIN_DELAY", "2.0")),
+            # Rate limits (0 requests per minute derives the limit from min_delay; 0 tokens means no limit)
+            "requests_per_minute": float(os.environ.get("REQUESTS_PER_MINUTE", "0")),
+            "tokens_per_minute": float(os.environ.get("TOKENS_PER_MINUTE", "0")),
             "max_retries": int(os.environ.get("MAX_RETRIES", "5")),
             "retry_delay": int(os.environ.get("RETRY_DELAY", "2"))
         }
@@ -58,6 +63,8 @@ class Config:
     # Processing settings
     options_count: int = DEFAULT_OPTIONS_COUNT
     batch_size: int = 20
+    use_batch_api: bool = False
+    compress_refined: bool = False
     
     # Context settings
     project_description: Optional[str] = None
@@ -66,6 +73,7 @@ class Config:
     
     # Runtime settings
     mock_mode: bool = False
+    pretty_report: bool = False
 
 
 def get_output_dirs(base_output_dir: str) -> Dict[str, str]:
@@ -93,7 +101,7 @@ def get_output_dirs(base_output_dir: str) -> Dict[str, str]:
     
     # Create directories if they don't exist
     for dir_path in dirs.values():
-        os.makedirs(dir_path, exist_ok=True)
+        ensure_dir(dir_path)
     
     return dirs
 
@@ -5,8 +5,12 @@ Provides specialized translation prompts with context.
 
 import os
 import json
+import functools
+from pathlib import Path
 from typing import Dict, Any, Optional
 
+from utils.serialization import fast_json
+
 # Default path for the prompt configuration
 DEFAULT_PROMPT_CONFIG_PATH = "prompts/default_prompts.json"
 
@@ -21,6 +25,7 @@ Translations should maintain the original meaning while being natural and idioma
 in the target language.
 """
 
+@functools.lru_cache(maxsize=None)
 def get_system_prompt(
     prompt_type: str,
     language: Optional[str] = None,
@@ -29,6 +34,7 @@ def get_system_prompt(
 ) -> str:
     """
     Get a system prompt for a specific task with optional context.
+    Rendered prompts are cached per argument combination for the lifetime of the process.
     
     Args:
         prompt_type: Type of prompt to retrieve (e.g., 'generate_options', 'select_translations')
@@ -41,8 +47,7 @@ def get_system_prompt(
     """
     # Load default prompts
     try:
-        with open(DEFAULT_PROMPT_CONFIG_PATH, "r", encoding="utf-8") as f:
-            prompt_config = json.load(f)
+        prompt_config = _load_prompt_config()
             
         # Check if the new prompt structure is used
         if "tasks" in prompt_config and prompt_type in prompt_config["tasks"]:
@@ -96,6 +101,17 @@ def get_system_prompt(
     
     return base_prompt.format(**format_vars)
 
+@functools.lru_cache(maxsize=1)
+def _load_prompt_config() -> Dict[str, Any]:
+    """
+    Load the default prompt configuration file.
+    The parsed file is cached, so it is read at most once per process.
+    
+    Returns:
+        Parsed prompt configuration
+    """
+    return fast_json.loads(Path(DEFAULT_PROMPT_CONFIG_PATH).read_bytes())
+
 def _get_minimal_prompt_templates() -> Dict[str, str]:
     """
     Get minimal default prompt templates as a fallback.
@@ -114,6 +130,17 @@ def _get_minimal_prompt_templates() -> Dict[str, str]:
             
             Respond with a JSON object with a 'translations' array containing arrays of options.
         """,
+        "generate_options_multilang": """
+            You are a professional translator specializing in {language}.
+            
+            Project Context: {project_context}
+            
+            Generate {options_count} different translations in each of these languages for each of the following English strings.
+            Each translation should be accurate but may use different wording or phrasing.
+            
+            Respond with a JSON object with a 'translations' array containing one object per string,
+            mapping each language identifier to an array of options.
+        """,
         "select_translations": """
             You are a translation expert for {language}.
             
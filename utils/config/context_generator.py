@@ -4,23 +4,51 @@ Uses LLMs to create domain-specific prompts for better translations.
 """
 
 import os
-import json
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-from utils.api.util_call import call_openai
+from utils.api.util_call import cache_openai_response, call_openai
+from utils.api.semantic_cache import DEFAULT_EMBEDDING_MODEL, embed_text, get_semantic_cache
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
 from utils.config.context_configuration import DEFAULT_PROJECT_DESCRIPTION
 
 # Default path for saving generated context configuration
 DEFAULT_CONTEXT_CONFIG_PATH = "prompts/context_config.json"
 
+# System prompt for context generation
+CONTEXT_SYSTEM_PROMPT = """
+    You are an expert localization engineer with deep experience in software and content localization across many languages and cultures.
+    
+    Your task is to analyze a project description and create specialized context that will help translators produce high-quality, culturally appropriate translations.
+    
+    For the project described, please provide:
+    
+    1. DOMAIN UNDERSTANDING: Identify the specific domain (e.g., e-commerce, healthcare, gaming) and explain key terminology that should be consistently translated
+    
+    2. AUDIENCE ANALYSIS: Define the target audience and their expectations regarding formality, technical language, and cultural references
+    
+    3. STYLE GUIDELINES: Provide guidance on tone, formality level, and writing style appropriate for this content
+    
+    4. TECHNICAL CONSTRAINTS: Note any character limitations, UI considerations, or technical concerns for translations
+    
+    5. CULTURAL ADAPTATION: Identify elements that may need cultural adaptation rather than direct translation
+    
+    6. LANGUAGE-SPECIFIC NOTES: If applicable, provide guidance for specific language groups (e.g., right-to-left languages, languages with gender agreement)
+    
+    Your output should be comprehensive yet concise, giving translators the context they need to produce translations that feel native and appropriate.
+    """
+
 def generate_context_configuration(
         project_description: str,
         model: str = "gpt-4o",
         save_to_file: bool = True,
         context_config_path: Optional[str] = None,
         prompt_config_path: Optional[str] = None,
-        mock_mode: bool = False
+        mock_mode: bool = False,
+        similarity_threshold: Optional[float] = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL
 ) -> Dict[str, str]:
     """
     Generate a specialized context for translation based on the project description.
@@ -32,6 +60,10 @@ def generate_context_configuration(
         context_config_path: Path to save the generated context (optional)
         prompt_config_path: Path to prompt configuration file (optional)
         mock_mode: Whether to run in mock mode without API calls
+        similarity_threshold: Reuse a context generated for a description at least this
+                              similar (cosine similarity of embeddings, e.g. 0.92);
+                              None (the default) disables reuse
+        embedding_model: Embedding model used to compare descriptions
         
     Returns:
         Dictionary with the generated context
@@ -53,9 +85,9 @@ def generate_context_configuration(
         # Save mock context to file if requested
         if save_to_file:
             config_path = prompt_config_path or "prompts/context_config.json"
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
+            ensure_dir(os.path.dirname(config_path))
             with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(mock_context, f, indent=2)
+                f.write(fast_json.dumps_pretty(mock_context))
             logging.info(f"Saved mock context configuration to {config_path}")
             
         return mock_context
@@ -63,67 +95,172 @@ def generate_context_configuration(
     # Use provided description or default
     description = project_description or DEFAULT_PROJECT_DESCRIPTION
     
-    # Create the prompt for context generation
-    system_prompt = """
-    You are an expert localization engineer with deep experience in software and content localization across many languages and cultures.
-    
-    Your task is to analyze a project description and create specialized context that will help translators produce high-quality, culturally appropriate translations.
-    
-    For the project described, please provide:
+    # Reuse the saved context if it was generated from the same description and model
+    save_path = context_config_path or DEFAULT_CONTEXT_CONFIG_PATH
+    content_hash = hashlib.sha256(f"{description}\n{model}".encode("utf-8")).hexdigest()
+    hash_path = os.path.splitext(save_path)[0] + ".hash"
+    if save_to_file:
+        try:
+            with open(hash_path, "r", encoding="utf-8") as f:
+                if f.read().strip() == content_hash:
+                    logging.info(f"Context configuration in {save_path} is up to date")
+                    return fast_json.load_file(save_path)
+        except (OSError, ValueError):
+            pass
     
-    1. DOMAIN UNDERSTANDING: Identify the specific domain (e.g., e-commerce, healthcare, gaming) and explain key terminology that should be consistently translated
+    context_config = generate_context_configurations(
+        [description],
+        model,
+        similarity_threshold=similarity_threshold,
+        embedding_model=embedding_model
+    )[0]
     
-    2. AUDIENCE ANALYSIS: Define the target audience and their expectations regarding formality, technical language, and cultural references
+    # Save to file if requested
+    if save_to_file:
+        ensure_dir(os.path.dirname(save_path))
+        
+        try:
+            _write_atomic(save_path, fast_json.dumps_pretty(context_config))
+            logging.info(f"Saved context configuration to {save_path}")
+            
+            # Only a generated context is worth reusing, not the fallback
+            if context_config != {"default_project_context": description}:
+                _write_atomic(hash_path, content_hash)
+        except Exception as e:
+            logging.error(f"Error saving context configuration: {e}")
     
-    3. STYLE GUIDELINES: Provide guidance on tone, formality level, and writing style appropriate for this content
+    return context_config 
+
+def generate_context_configurations(
+        project_descriptions: List[str],
+        model: str = "gpt-4o",
+        batch_size: int = 8,
+        similarity_threshold: Optional[float] = None,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL
+) -> List[Dict[str, str]]:
+    """
+    Generate specialized translation contexts for several project descriptions,
+    sending up to batch_size descriptions per API call.
     
-    4. TECHNICAL CONSTRAINTS: Note any character limitations, UI considerations, or technical concerns for translations
+    Args:
+        project_descriptions: Descriptions of the projects
+        model: LLM model to use for context generation
+        batch_size: Maximum number of descriptions per API call
+        similarity_threshold: Reuse a context generated for a description at least this
+                              similar (cosine similarity of embeddings, e.g. 0.92);
+                              None (the default) disables reuse
+        embedding_model: Embedding model used to compare descriptions
+        
+    Returns:
+        List of context dictionaries in the same order as the descriptions
+    """
+    contexts = [None] * len(project_descriptions)
+    embeddings = [None] * len(project_descriptions)
+    cache_namespace = f"context_configuration:{model}"
     
-    5. CULTURAL ADAPTATION: Identify elements that may need cultural adaptation rather than direct translation
+    # Reuse the context of a sufficiently similar earlier description
+    if similarity_threshold is not None:
+        try:
+            semantic_cache = get_semantic_cache()
+            for i, description in enumerate(project_descriptions):
+                embeddings[i] = embed_text(description, embedding_model)
+                contexts[i] = semantic_cache.lookup(cache_namespace, embeddings[i], similarity_threshold)
+                if contexts[i] is not None:
+                    logging.info(f"Reusing the context of a similar project description for: {description[:80]}")
+        except Exception as e:
+            logging.warning(f"Semantic cache unavailable, generating context: {e}")
     
-    6. LANGUAGE-SPECIFIC NOTES: If applicable, provide guidance for specific language groups (e.g., right-to-left languages, languages with gender agreement)
+    # Generate the remaining contexts in batches
+    missing = [i for i, context in enumerate(contexts) if context is None]
+    for start in range(0, len(missing), batch_size):
+        batch_indices = missing[start:start + batch_size]
+        batch_contexts = _request_contexts([project_descriptions[i] for i in batch_indices], model)
+        
+        for i, context_config in zip(batch_indices, batch_contexts):
+            if context_config is None:
+                # Fallback to using the project description directly
+                contexts[i] = {"default_project_context": project_descriptions[i]}
+                continue
+            contexts[i] = context_config
+            if embeddings[i] is not None:
+                get_semantic_cache().add(cache_namespace, embeddings[i], context_config)
     
-    Your output should be comprehensive yet concise, giving translators the context they need to produce translations that feel native and appropriate.
+    return contexts
+
+def _request_contexts(descriptions: List[str], model: str) -> List[Optional[Dict[str, str]]]:
     """
+    Request contexts for a batch of project descriptions in a single API call.
     
-    user_prompt = f"""
+    Args:
+        descriptions: Project descriptions to generate contexts for
+        model: LLM model to use for context generation
+        
+    Returns:
+        List with a context dictionary per description, or None where generation failed
+    """
+    if len(descriptions) == 1:
+        user_prompt = f"""
     Project Description:
-    {description}
+    {descriptions[0]}
     
     Please generate a specialized context for this translation project.
     Respond with JSON containing a 'default_project_context' field with the context.
     """
+    else:
+        numbered = "\n    ".join(f"{i}. {description}" for i, description in enumerate(descriptions, 1))
+        user_prompt = f"""
+    Projects:
+    {numbered}
+    
+    Please generate a specialized context for each of these translation projects.
+    Respond with JSON of the form {{"contexts": [{{"default_project_context": "..."}}, ...]}}
+    containing one entry per project, in the same order as the projects.
+    """
     
     # Call the model to generate specialized context
     technical_prompt = {
-        "system": system_prompt,
+        "system": CONTEXT_SYSTEM_PROMPT,
         "user": user_prompt,
         "response_format": {"type": "json_object"}
     }
     
     try:
         response_text = call_openai(prompt=technical_prompt, model=model)
-        context_config = json.loads(response_text)
-        
-        # Validate the response format
-        if "default_project_context" not in context_config:
-            logging.warning("API response missing 'default_project_context' field")
-            context_config = {"default_project_context": description}
+        response_data = fast_json.loads(response_text)
     except Exception as e:
         logging.error(f"Error generating context configuration: {e}")
-        # Fallback to using the project description directly
-        context_config = {"default_project_context": description}
+        return [None] * len(descriptions)
     
-    # Save to file if requested
-    if save_to_file:
-        save_path = context_config_path or DEFAULT_CONTEXT_CONFIG_PATH
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        
-        try:
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(context_config, f, indent=2, ensure_ascii=False)
-            logging.info(f"Saved context configuration to {save_path}")
-        except Exception as e:
-            logging.error(f"Error saving context configuration: {e}")
+    contexts = [response_data] if len(descriptions) == 1 else (
+        response_data.get("contexts") if isinstance(response_data, dict) else None
+    )
+    if not isinstance(contexts, list) or len(contexts) != len(descriptions):
+        logging.warning(f"API response did not contain {len(descriptions)} contexts")
+        return [None] * len(descriptions)
     
-    return context_config 
\ No newline at end of file
+    # Validate the response format
+    results = []
+    for context_config in contexts:
+        if isinstance(context_config, dict) and "default_project_context" in context_config:
+            results.append(context_config)
+        else:
+            logging.warning("API response missing 'default_project_context' field")
+            results.append(None)
+    
+    # Only a fully usable reply is cached, so a bad one is requested again on the next run
+    if all(result is not None for result in results):
+        cache_openai_response(technical_prompt, response_text, model)
+    return results
+
+def _write_atomic(path: str, text: str) -> None:
+    """
+    Write a text file through a temporary file so readers never see a partial write.
+    
+    Args:
+        path: Path of the file to write
+        text: File contents
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
@@ -0,0 +1,21 @@
+"""
+Directory helpers shared by the pipeline steps.
+Output directories are created once per process instead of on every write.
+"""
+
+import os
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_dir(path: str) -> None:
+    """
+    Create a directory and its parents unless this process already did so.
+    Assumes directories are not removed while the process runs; call
+    ensure_dir.cache_clear() after deleting one that will be reused.
+
+    Args:
+        path: Directory to create (an empty path means the current directory)
+    """
+    if path:
+        os.makedirs(path, exist_ok=True)
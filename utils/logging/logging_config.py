@@ -4,34 +4,70 @@ Centralizes logging setup and model usage tracking.
 """
 
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
 import datetime
+import threading
+from collections import defaultdict
 from typing import Dict, Optional
-import json
+
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
+
+# Shared formatter for every handler installed by setup_logging
+LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
+# Buffer size of the log file; records below WARNING are written once it fills up
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches writes instead of flushing after every record."""
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, encoding=self.encoding,
+                    errors=self.errors, buffering=LOG_FILE_BUFFER_SIZE)
+    
+    def emit(self, record: logging.LogRecord):
+        """Write a record, flushing right away only for warnings and errors."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
 
 # Define model usage tracker for analytics
 class ModelUsage:
     """Track and log model usage statistics."""
     
     def __init__(self):
-        self.usage = {}
+        self.usage = defaultdict(int)
+        self._lock = threading.Lock()
         self.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     
     def add_words(self, model: str, count: int):
-        """Add word count for a model."""
-        if model not in self.usage:
-            self.usage[model] = 0
-        self.usage[model] += count
+        """Add word count for a model. Safe to call from several threads."""
+        with self._lock:
+            self.usage[model] += count
     
     def print_summary(self):
         """Print summary of model usage."""
-        if not self.usage:
+        with self._lock:
+            usage = dict(self.usage)
+        if not usage:
             return
             
         print("\nModel Usage Summary:")
         print("-" * 50)
         total_words = 0
-        for model, words in self.usage.items():
+        for model, words in usage.items():
             print(f"{model}: {words:,} words")
             total_words += words
         print("-" * 50)
@@ -39,21 +75,32 @@ class ModelUsage:
         
         # Save usage to file
         usage_dir = os.path.join("logs", "model_usage")
-        os.makedirs(usage_dir, exist_ok=True)
+        ensure_dir(usage_dir)
         usage_file = os.path.join(usage_dir, f"usage_{self.timestamp}.json")
         
-        with open(usage_file, 'w') as f:
-            json.dump({
+        with open(usage_file, 'w', encoding='utf-8') as f:
+            f.write(fast_json.dumps_pretty({
                 "timestamp": self.timestamp,
-                "usage": self.usage,
+                "usage": usage,
                 "total_words": total_words
-            }, f, indent=2)
+            }))
         
         print(f"\nUsage details saved to {usage_file}")
 
 # Create global instance
 model_usage = ModelUsage()
 
+# Queue handler and listener installed by setup_logging
+_queue_handler = None
+_queue_listener = None
+
+def _stop_queue_listener():
+    """Flush queued log records at interpreter exit."""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+atexit.register(_stop_queue_listener)
+
 def setup_logging(log_file: Optional[str] = None, log_level: str = "INFO"):
     """
     Set up logging configuration.
@@ -62,24 +109,39 @@ def setup_logging(log_file: Optional[str] = None, log_level: str = "INFO"):
         log_file: Path to log file (optional)
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _queue_handler, _queue_listener
+    
     # Convert string log level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(numeric_level)
     
-    # Configure root logger
-    logging.basicConfig(
-        level=numeric_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    # Replace the queue installed by an earlier call
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        root_logger.removeHandler(_queue_handler)
+        for handler in _queue_listener.handlers:
+            handler.close()
+    
+    # Log to the console unless the root logger already has handlers (as basicConfig would)
+    handlers = []
+    if not root_logger.handlers:
+        handlers.append(logging.StreamHandler())
     
     # Add file handler if log file is specified
     if log_file:
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        ))
-        logging.getLogger().addHandler(file_handler)
+        ensure_dir(os.path.dirname(log_file))
+        handlers.append(BufferedFileHandler(log_file, encoding='utf-8'))
+    
+    for handler in handlers:
+        handler.setFormatter(LOG_FORMATTER)
+    
+    # Callers only enqueue records; a background thread does the actual writes
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    root_logger.addHandler(_queue_handler)
     
     # Adjust other loggers
     logging.getLogger("requests").setLevel(logging.WARNING)
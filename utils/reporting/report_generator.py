@@ -3,12 +3,16 @@ Module for generating summary reports of the translation process.
 Provides detailed metrics and quality assessments for each language and file.
 """
 
-import os
-import json
 import csv
 import datetime
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
+
 def generate_summary_report(
         validation_results: Dict[str, Dict[str, Dict[str, Any]]],
         input_dir: str,
@@ -16,7 +20,8 @@ def generate_summary_report(
         languages: List[str],
         files: List[str],
         models: Dict[str, str],
-        log_dir: str
+        log_dir: str,
+        pretty: bool = False
 ) -> str:
     """
     Generate a summary report of the translation process and quality.
@@ -29,21 +34,22 @@ def generate_summary_report(
         files: List of processed files
         models: Dictionary mapping steps to model names
         log_dir: Directory to save report files
+        pretty: Whether to also write an indented copy of the JSON report
         
     Returns:
         Path to the generated report file
     """
     # Create reports directory if it doesn't exist
-    reports_dir = os.path.join(log_dir, "reports")
-    os.makedirs(reports_dir, exist_ok=True)
+    reports_dir = Path(log_dir) / "reports"
+    ensure_dir(str(reports_dir))
     
     # Generate timestamp for report
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_filename = f"translation_report_{timestamp}.json"
-    report_path = os.path.join(reports_dir, report_filename)
+    report_stem = f"translation_report_{timestamp}"
+    report_path = reports_dir / f"{report_stem}.json"
     
     # CSV report for easier viewing
-    csv_report_path = os.path.join(reports_dir, f"translation_report_{timestamp}.csv")
+    csv_report_path = reports_dir / f"{report_stem}.csv"
     
     # Generate report data
     report_data = {
@@ -63,102 +69,100 @@ def generate_summary_report(
         "file_results": {}
     }
     
-    # Calculate summary metrics
-    all_quality_scores = []
-    all_structure_scores = []
-    language_quality_scores = {lang: [] for lang in languages}
-    language_structure_scores = {lang: [] for lang in languages}
-    file_quality_scores = {file: [] for file in files}
-    file_structure_scores = {file: [] for file in files}
-    
-    # Process validation results
-    for filename, lang_results in validation_results.items():
-        for language, results in lang_results.items():
-            quality_score = results.get("quality_score", 0)
-            structure_score = results.get("structure_score", 0)
-            
-            # Add to overall metrics
-            all_quality_scores.append(quality_score)
-            all_structure_scores.append(structure_score)
-            
-            # Add to language-specific metrics
-            if language in language_quality_scores:
-                language_quality_scores[language].append(quality_score)
-                language_structure_scores[language].append(structure_score)
-            
-            # Add to file-specific metrics
-            if filename in file_quality_scores:
-                file_quality_scores[filename].append(quality_score)
-                file_structure_scores[filename].append(structure_score)
+    # Flatten validation results into one row per (file, language) pair,
+    # tagged with the file and language index used for grouped averages
+    file_index = {filename: i for i, filename in enumerate(files)}
+    language_index = {language: i for i, language in enumerate(languages)}
+    entries = np.array(
+        [
+            (
+                file_index.get(filename, -1),
+                language_index.get(language, -1),
+                results.get("quality_score", 0),
+                results.get("structure_score", 0)
+            )
+            for filename, lang_results in validation_results.items()
+            for language, results in lang_results.items()
+        ],
+        dtype=np.float64
+    ).reshape(-1, 4)
+    file_ids = entries[:, 0].astype(np.intp)
+    language_ids = entries[:, 1].astype(np.intp)
+    quality_scores = entries[:, 2]
+    structure_scores = entries[:, 3]
     
     # Calculate averages
-    report_data["summary"]["average_quality_score"] = _calculate_average(all_quality_scores)
-    report_data["summary"]["average_structure_score"] = _calculate_average(all_structure_scores)
+    report_data["summary"]["average_quality_score"] = _calculate_average(quality_scores)
+    report_data["summary"]["average_structure_score"] = _calculate_average(structure_scores)
     
-    # Calculate language-specific averages
+    summary = report_data["summary"]
+    language_quality = _grouped_average(language_ids, quality_scores, len(languages))
+    language_structure = _grouped_average(language_ids, structure_scores, len(languages))
+    file_quality = _grouped_average(file_ids, quality_scores, len(files))
+    file_structure = _grouped_average(file_ids, structure_scores, len(files))
+    
+    # Fill the language- and file-specific averages and build the CSV summary rows in the same pass
+    csv_rows = [
+        ["Category", "Item", "Quality Score", "Structure Score"],
+        ["Overall", "Average", f"{summary['average_quality_score']:.2f}", f"{summary['average_structure_score']:.2f}"],
+        [],
+        ["Languages", "", "", ""]
+    ]
     for language in languages:
+        i = language_index[language]
+        quality, structure = float(language_quality[i]), float(language_structure[i])
         report_data["language_results"][language] = {
-            "average_quality_score": _calculate_average(language_quality_scores[language]),
-            "average_structure_score": _calculate_average(language_structure_scores[language])
+            "average_quality_score": quality,
+            "average_structure_score": structure
         }
-    
-    # Calculate file-specific averages
+        csv_rows.append(["Language", language, f"{quality:.2f}", f"{structure:.2f}"])
+    csv_rows += [[], ["Files", "", "", ""]]
     for filename in files:
+        i = file_index[filename]
+        quality, structure = float(file_quality[i]), float(file_structure[i])
         report_data["file_results"][filename] = {
-            "average_quality_score": _calculate_average(file_quality_scores[filename]),
-            "average_structure_score": _calculate_average(file_structure_scores[filename])
+            "average_quality_score": quality,
+            "average_structure_score": structure
         }
+        csv_rows.append(["File", filename, f"{quality:.2f}", f"{structure:.2f}"])
     
-    # Save full report as JSON
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, indent=2, ensure_ascii=False)
+    # Language and file names are user input, so let the csv module quote them
+    with csv_report_path.open('w', newline='', encoding='utf-8') as csv_file:
+        csv.writer(csv_file).writerows(csv_rows)
     
-    # Generate CSV summary report
-    with open(csv_report_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        
-        # Write header
-        writer.writerow(["Category", "Item", "Quality Score", "Structure Score"])
-        
-        # Write overall summary
-        writer.writerow([
-            "Overall", 
-            "Average", 
-            f"{report_data['summary']['average_quality_score']:.2f}",
-            f"{report_data['summary']['average_structure_score']:.2f}"
-        ])
-        writer.writerow([])
-        
-        # Write language summaries
-        writer.writerow(["Languages", "", "", ""])
-        for language in languages:
-            lang_results = report_data["language_results"][language]
-            writer.writerow([
-                "Language",
-                language,
-                f"{lang_results['average_quality_score']:.2f}",
-                f"{lang_results['average_structure_score']:.2f}"
-            ])
-        writer.writerow([])
-        
-        # Write file summaries
-        writer.writerow(["Files", "", "", ""])
-        for filename in files:
-            file_results = report_data["file_results"][filename]
-            writer.writerow([
-                "File",
-                filename,
-                f"{file_results['average_quality_score']:.2f}",
-                f"{file_results['average_structure_score']:.2f}"
-            ])
+    # Save full report as compact JSON
+    report_path.write_text(fast_json.dumps(report_data), encoding='utf-8')
+    
+    # Save an indented copy only when a human-readable report is requested
+    if pretty:
+        pretty_report_path = reports_dir / f"{report_stem}.pretty.json"
+        pretty_report_path.write_text(fast_json.dumps_pretty(report_data), encoding='utf-8')
     
     print(f"Generated summary report at {report_path}")
     print(f"Generated CSV report at {csv_report_path}")
     
-    return report_path
+    return str(report_path)
+
+def _grouped_average(group_ids: np.ndarray, values: np.ndarray, group_count: int) -> np.ndarray:
+    """
+    Average values per group, skipping entries with a negative group index.
+    
+    Args:
+        group_ids: Group index of each value (-1 for values outside every group)
+        values: Values to average
+        group_count: Number of groups
+        
+    Returns:
+        Array of per-group averages, 0.0 for groups without values
+    """
+    known = group_ids >= 0
+    ids = group_ids[known]
+    sums = np.bincount(ids, weights=values[known], minlength=group_count)
+    counts = np.bincount(ids, minlength=group_count)
+    return np.divide(sums, counts, out=np.zeros(group_count), where=counts > 0)
 
-def _calculate_average(values: List) -> float:
-    """Calculate average of a list of values, handling empty lists."""
-    if not values:
+def _calculate_average(values: np.ndarray) -> float:
+    """Calculate average of an array of values, handling empty arrays."""
+    if len(values) == 0:
         return 0.0
-    return sum(values) / len(values) 
\ No newline at end of file
+    return float(values.mean()) 
\ No newline at end of file
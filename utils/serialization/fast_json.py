@@ -0,0 +1,88 @@
+"""
+JSON helpers for hot parsing and serialization paths.
+Uses orjson when it is installed and falls back to the standard json module otherwise.
+"""
+
+import os
+import json
+import mmap
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files at least this large are memory-mapped by load_file instead of read into memory
+MMAP_MIN_SIZE = 4096
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: JSON text as str or UTF-8 bytes
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: str) -> Any:
+    """
+    Parse a JSON file. With orjson, large files are parsed straight from a
+    memory map instead of being copied into a bytes object first.
+
+    Args:
+        path: Path of the JSON file
+
+    Returns:
+        Parsed Python object
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as buffer:
+                return orjson.loads(buffer)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to compact JSON, keeping non-ASCII characters as-is.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON text without insignificant whitespace
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps_pretty(obj: Any) -> str:
+    """
+    Serialize an object to JSON indented by two spaces, keeping non-ASCII characters as-is.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        Indented JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2)
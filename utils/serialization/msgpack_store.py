@@ -0,0 +1,41 @@
+"""
+MessagePack persistence for intermediate pipeline data.
+Intermediates are smaller and faster to reload as MessagePack than as JSON or CSV.
+The msgpack package is optional; check AVAILABLE before calling dump or load.
+"""
+
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Whether MessagePack persistence can be used
+AVAILABLE = msgpack is not None
+
+
+def dump(obj: Any, path: str) -> None:
+    """
+    Write an object to a MessagePack file.
+
+    Args:
+        obj: Object to serialize (dicts, lists, strings and numbers)
+        path: Path of the file to write
+    """
+    with open(path, 'wb') as f:
+        f.write(msgpack.packb(obj, use_bin_type=True))
+
+
+def load(path: str) -> Any:
+    """
+    Read an object from a MessagePack file.
+
+    Args:
+        path: Path of the file to read
+
+    Returns:
+        Deserialized object
+    """
+    with open(path, 'rb') as f:
+        return msgpack.unpackb(f.read(), raw=False)
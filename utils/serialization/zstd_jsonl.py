@@ -0,0 +1,71 @@
+"""
+Zstandard-compressed JSON Lines files for intermediate pipeline data.
+Translation text is highly repetitive, so these files are much smaller than CSV.
+The zstandard package is optional; check AVAILABLE before using this module.
+"""
+
+import io
+import json
+from typing import Any, Dict, Iterator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Whether compressed JSON Lines files can be used
+AVAILABLE = zstandard is not None
+
+# File extension for compressed JSON Lines files
+EXTENSION = ".jsonl.zst"
+
+
+class JsonlZstWriter:
+    """Streaming writer that appends one JSON record per line to a compressed file."""
+
+    def __init__(self, path: str, level: int = 6):
+        """
+        Open the file for writing.
+
+        Args:
+            path: Path of the file to write
+            level: Zstandard compression level
+        """
+        self._file = open(path, 'wb')
+        self._writer = zstandard.ZstdCompressor(level=level).stream_writer(self._file)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one record."""
+        self._writer.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    def flush(self) -> None:
+        """Flush everything written so far to disk."""
+        self._writer.flush()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Finish the compressed stream and close the file."""
+        self._writer.close()
+
+    def __enter__(self) -> "JsonlZstWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the records of a compressed JSON Lines file.
+
+    Args:
+        path: Path of the file to read
+
+    Returns:
+        Iterator over the records in file order
+    """
+    with open(path, 'rb') as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f)
+        for line in io.TextIOWrapper(reader, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
@@ -4,15 +4,58 @@ These checks run before the main process to ensure all prerequisites are met.
 """
 
 import os
+import re
+import stat
 import json
+import hashlib
 import logging
-from typing import Optional
-from openai import OpenAI
+from typing import Dict, Optional, Tuple
 import time
 
+from utils.serialization import fast_json
+from utils.filesystem.directories import ensure_dir
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Expected shape of an OpenAI API key (checked locally, without a network call)
+API_KEY_PREFIXES = ("sk-proj-", "sk-")
+API_KEY_PATTERN = re.compile(r"^sk-[A-Za-z0-9_\-]{20,}$")
+
+# Where successful API access checks are remembered, and for how long (seconds)
+API_CHECK_CACHE_DIR = os.path.join("cache", "api_checks")
+API_CHECK_TTL = 24 * 60 * 60
+
+# File in the output directory recording the last passing preflight, and how long it is trusted (seconds)
+PREFLIGHT_CACHE_FILE = ".preflight_cache.json"
+PREFLIGHT_CACHE_TTL = 24 * 60 * 60
+
+# Languages known to translate well
+_STANDARD_LANGUAGES = frozenset((
+    "Thai", "Malay", "Simplified Chinese", "Traditional Chinese", 
+    "Hebrew", "Spanish", "French", "German", "Italian", "Japanese",
+    "Korean", "Portuguese", "Russian", "Arabic", "English", "Dutch",
+    "Vietnamese", "Indonesian", "Greek", "Turkish", "Hindi", "Bengali",
+    "Polish", "Swedish", "Norwegian", "Danish", "Finnish", "Burmese"
+))
+_STANDARD_LANGUAGES_LOWER = {language.lower(): language for language in _STANDARD_LANGUAGES}
+
+# Environment file holding the API credentials; editing it invalidates saved API checks
+ENV_FILE = ".env"
+
+# In-process results of API access checks (passed or failed), keyed by API key hash
+API_PROBE_TTL = 300
+
+# Seconds to wait for the API access check before treating it as failed
+API_PROBE_TIMEOUT = 10
+_api_probe_cache: Dict[str, Tuple[float, bool]] = {}
+
 def test_openai_access(api_key: str) -> bool:
     """
-    Test OpenAI API access by making a simple completion request.
+    Test OpenAI API access by listing the available models with the shared client.
+    Results are remembered in-process for API_PROBE_TTL seconds, and a successful
+    check is also remembered on disk for API_CHECK_TTL seconds. Editing the .env
+    file invalidates both.
     
     Args:
         api_key: OpenAI API key to test
@@ -20,34 +63,75 @@ def test_openai_access(api_key: str) -> bool:
     Returns:
         Boolean indicating whether the API key is valid and working
     """
-    try:
-        from utils.api.util_call import call_openai
-        
-        # Create a simple test prompt that includes the word 'json' for response_format compatibility
-        test_prompt = {
-            "system": "You are a helpful assistant. Please respond with a simple JSON test message.",
-            "user": "Return a simple JSON test response.",
-            "response_format": {"type": "json_object"}
-        }
-        
-        # Use the proper API wrapper with rate limiting
-        response = call_openai(
-            prompt=test_prompt,
-            model="gpt-4o",
-            timeout=10  # Add a reasonable timeout
-        )
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    env_stat = _stat_or_none(ENV_FILE)
+    env_mtime = env_stat.st_mtime_ns if env_stat else 0
+    
+    # Reuse the result of a recent check in this process
+    cache_key = f"{key_hash}:{env_mtime}"
+    cached = _api_probe_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < API_PROBE_TTL:
+        return cached[1]
+    
+    ok = _probe_openai_access(api_key, key_hash[:16], env_mtime)
+    _api_probe_cache[cache_key] = (time.monotonic(), ok)
+    return ok
+
+def _probe_openai_access(api_key: str, key_id: str, env_mtime: int = 0) -> bool:
+    """
+    Check API access, reusing a successful check saved on disk.
+    
+    Args:
+        api_key: OpenAI API key to test
+        key_id: Short hash of the key used to name the saved check
+        env_mtime: Modification time of the .env file in nanoseconds (0 if absent);
+                   saved checks older than this are ignored
         
-        # If we got here, the API call was successful
+    Returns:
+        Boolean indicating whether the API key is valid and working
+    """
+    check_path = os.path.join(API_CHECK_CACHE_DIR, f"models_{key_id}.json")
+    
+    # Reuse a recent successful check made since the .env file last changed
+    check_stat = _stat_or_none(check_path)
+    if (check_stat is not None and check_stat.st_mtime_ns >= env_mtime
+            and time.time() - check_stat.st_mtime < API_CHECK_TTL):
+        logger.info("OpenAI API access was verified recently; skipping the network check")
         return True
+    
+    try:
+        from utils.api.llm_api import get_openai_client
+        
+        # Listing models is free and is not answered from the LLM response cache
+        # A single attempt keeps the check within API_PROBE_TIMEOUT (no SDK retries)
+        client = get_openai_client(api_key).with_options(timeout=API_PROBE_TIMEOUT, max_retries=0)
+        models = [model.id for model in client.models.list()]
     except Exception as e:
-        logging.error(f"OpenAI API access test failed: {str(e)}")
+        logger.error("OpenAI API access test failed: %s", e)
         return False
+    
+    try:
+        ensure_dir(API_CHECK_CACHE_DIR)
+        with open(check_path, 'w', encoding='utf-8') as f:
+            f.write(fast_json.dumps(models))
+    except OSError as e:
+        logger.warning("Could not save API check result: %s", e)
+    
+    return True
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """Stat a path, returning None if it does not exist or cannot be accessed."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
 
 def run_preflight_checks(
     input_dir: str,
     output_dir: str,
     prompt_config: Optional[str] = None,
-    mock_mode: bool = False
+    mock_mode: bool = False,
+    verify_api: bool = False
 ) -> bool:
     """
     Run checks to validate configuration and environment before launching the pipeline.
@@ -57,78 +141,142 @@ def run_preflight_checks(
         output_dir: Output directory for generated files
         prompt_config: Optional custom prompt configuration file
         mock_mode: Whether to run in mock mode without API calls
+        verify_api: Whether to test API access with a real request (also enabled by
+                    the VERIFY_API_KEY environment variable); otherwise only the key
+                    format is checked and connection errors surface on the first call
         
     Returns:
         Boolean indicating whether all checks passed
     """
+    # Skip every check if an earlier run passed them with the same inputs
+    signature = None
+    cache_path = os.path.join(output_dir, PREFLIGHT_CACHE_FILE)
+    if not mock_mode and not os.getenv("PREFLIGHT_NO_CACHE"):
+        signature = _preflight_signature(input_dir, prompt_config, verify_api)
+        if signature is not None and _preflight_cache_matches(cache_path, signature):
+            logger.info("Pre-flight checks passed recently with the same inputs (preflight cached)")
+            return True
+    
     checks_passed = True
     
-    # Check input directory
-    if not os.path.exists(input_dir):
-        logging.error(f"Input directory does not exist: {input_dir}")
+    # Check input directory: opening it reports a missing path or a file,
+    # and the scan stops at the first JSON file
+    try:
+        with os.scandir(input_dir) as entries:
+            has_json = any(entry.name.endswith('.json') and entry.is_file() for entry in entries)
+        if not has_json:
+            logger.warning("No JSON files found in input directory: %s", input_dir)
+    except FileNotFoundError:
+        logger.error("Input directory does not exist: %s", input_dir)
         checks_passed = False
-    elif not os.path.isdir(input_dir):
-        logging.error(f"Input path is not a directory: {input_dir}")
+    except NotADirectoryError:
+        logger.error("Input path is not a directory: %s", input_dir)
         checks_passed = False
-    elif not any(f.endswith('.json') for f in os.listdir(input_dir)):
-        logging.warning(f"No JSON files found in input directory: {input_dir}")
     
     # Check output directory
-    if os.path.exists(output_dir) and not os.path.isdir(output_dir):
-        logging.error(f"Output path exists but is not a directory: {output_dir}")
+    output_stat = _stat_or_none(output_dir)
+    if output_stat is not None and not stat.S_ISDIR(output_stat.st_mode):
+        logger.error("Output path exists but is not a directory: %s", output_dir)
         checks_passed = False
-    elif not os.path.exists(output_dir):
+    elif output_stat is None:
         try:
-            os.makedirs(output_dir, exist_ok=True)
-            logging.info(f"Created output directory: {output_dir}")
+            ensure_dir(output_dir)
+            logger.info("Created output directory: %s", output_dir)
         except Exception as e:
-            logging.error(f"Failed to create output directory: {e}")
+            logger.error("Failed to create output directory: %s", e)
             checks_passed = False
     
     # Check prompt configuration if provided
-    if prompt_config and not os.path.exists(prompt_config):
-        logging.error(f"Prompt configuration file not found: {prompt_config}")
-        checks_passed = False
-    elif prompt_config:
+    if prompt_config:
         try:
-            with open(prompt_config, 'r', encoding='utf-8') as f:
-                json.load(f)  # Validate JSON format
-            logging.info(f"Prompt configuration file validated: {prompt_config}")
+            fast_json.load_file(prompt_config)  # Validate JSON format
+            logger.info("Prompt configuration file validated: %s", prompt_config)
+        except FileNotFoundError:
+            logger.error("Prompt configuration file not found: %s", prompt_config)
+            checks_passed = False
         except json.JSONDecodeError:
-            logging.error(f"Invalid JSON format in prompt configuration: {prompt_config}")
+            logger.error("Invalid JSON format in prompt configuration: %s", prompt_config)
             checks_passed = False
         except Exception as e:
-            logging.error(f"Error reading prompt configuration: {e}")
+            logger.error("Error reading prompt configuration: %s", e)
             checks_passed = False
     
     # Check API key and access if not in mock mode
     if not mock_mode:
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
-            logging.error("OPENAI_API_KEY not found in environment variables")
+            logger.error("OPENAI_API_KEY not found in environment variables")
             checks_passed = False
         else:
             # Verify API key format
-            if not api_key.startswith(("sk-", "sk-proj-")):
-                logging.error("Invalid OpenAI API key format. Key should start with 'sk-' or 'sk-proj-'")
+            if not api_key.startswith(API_KEY_PREFIXES):
+                logger.error("Invalid OpenAI API key format. Key should start with 'sk-' or 'sk-proj-'")
                 checks_passed = False
-            else:
-                # Test API access
-                logging.info("Testing OpenAI API access...")
+            elif not API_KEY_PATTERN.match(api_key):
+                logger.warning("OpenAI API key looks malformed (unexpected length or characters)")
+            
+            # Test API access only when explicitly requested
+            if checks_passed and (verify_api or os.getenv("VERIFY_API_KEY")):
+                logger.info("Testing OpenAI API access...")
                 if not test_openai_access(api_key):
-                    logging.error("Failed to connect to OpenAI API. Please check your API key and internet connection.")
+                    logger.error("Failed to connect to OpenAI API. Please check your API key and internet connection.")
                     checks_passed = False
                 else:
-                    logging.info("OpenAI API access verified successfully")
+                    logger.info("OpenAI API access verified successfully")
     
     # Print check results
     if checks_passed:
-        logging.info("All pre-flight checks passed successfully")
+        logger.info("All pre-flight checks passed successfully")
+        if signature is not None:
+            _save_preflight_cache(cache_path, signature)
     else:
-        logging.error("Some pre-flight checks failed")
+        logger.error("Some pre-flight checks failed")
     
     return checks_passed
 
+def _preflight_signature(input_dir: str, prompt_config: Optional[str], verify_api: bool) -> Optional[str]:
+    """
+    Fingerprint the inputs of the preflight checks.
+    
+    Args:
+        input_dir: Input directory containing JSON files
+        prompt_config: Optional custom prompt configuration file
+        verify_api: Whether API access is tested
+        
+    Returns:
+        Hex digest identifying the inputs, or None if a path cannot be accessed
+    """
+    input_stat = _stat_or_none(input_dir)
+    prompt_stat = _stat_or_none(prompt_config) if prompt_config else None
+    if input_stat is None or (prompt_config and prompt_stat is None):
+        return None
+    
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    signature = [
+        os.path.abspath(input_dir), input_stat.st_mtime_ns,
+        os.path.abspath(prompt_config) if prompt_config else "",
+        prompt_stat.st_mtime_ns if prompt_stat else 0,
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16],
+        bool(verify_api or os.getenv("VERIFY_API_KEY"))
+    ]
+    return hashlib.sha256(fast_json.dumps(signature).encode("utf-8")).hexdigest()
+
+def _preflight_cache_matches(cache_path: str, signature: str) -> bool:
+    """Check whether the preflight cache holds this signature and has not expired."""
+    try:
+        cached = fast_json.load_file(cache_path)
+        return cached["signature"] == signature and time.time() - cached["timestamp"] < PREFLIGHT_CACHE_TTL
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+def _save_preflight_cache(cache_path: str, signature: str) -> None:
+    """Remember that the preflight checks passed for this signature."""
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(fast_json.dumps({"signature": signature, "timestamp": time.time()}))
+    except OSError as e:
+        logger.warning("Could not save preflight cache: %s", e)
+
 def validate_languages(languages: list) -> list:
     """
     Validate the list of target languages.
@@ -139,25 +287,16 @@ def validate_languages(languages: list) -> list:
     Returns:
         Validated and normalized list of languages
     """
-    # Make a copy to avoid modifying the original
-    validated_languages = list(languages)
-    
-    # Normalize language names
-    for i, lang in enumerate(validated_languages):
-        # Capitalize first letter of each word
-        validated_languages[i] = ' '.join(word.capitalize() for word in lang.split())
-    
-    # Log warning for any potentially unsupported languages
-    standard_languages = {
-        "Thai", "Malay", "Simplified Chinese", "Traditional Chinese", 
-        "Hebrew", "Spanish", "French", "German", "Italian", "Japanese",
-        "Korean", "Portuguese", "Russian", "Arabic", "English", "Dutch",
-        "Vietnamese", "Indonesian", "Greek", "Turkish", "Hindi", "Bengali",
-        "Polish", "Swedish", "Norwegian", "Danish", "Finnish", "Burmese"
-    }
-    
-    for lang in validated_languages:
-        if lang not in standard_languages:
-            logging.warning(f"Language '{lang}' might not be fully supported")
-    
-    return validated_languages 
\ No newline at end of file
+    # Normalize language names: collapse runs of whitespace, then look up standard
+    # languages in one step and capitalize the first letter of each word of others
+    validated_languages = [
+        _STANDARD_LANGUAGES_LOWER.get(lang.lower()) or lang.title()
+        for lang in (' '.join(lang.split()) for lang in languages)
+    ]
+    
+    # Log one warning listing any potentially unsupported languages
+    unknown = [lang for lang in dict.fromkeys(validated_languages) if lang not in _STANDARD_LANGUAGES]
+    if unknown:
+        logger.warning("Languages might not be fully supported: %s", ', '.join(unknown))
+    
+    return validated_languages 